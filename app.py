@@ -37,15 +37,27 @@ JUNIOR DEVELOPER NOTES:
 # IMPORTS - Loading Required Libraries
 # ============================================================================
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import (
+    Flask, Response, render_template, stream_template, request, redirect, url_for,
+    flash, get_flashed_messages, jsonify, session, stream_with_context
+)
+from jinja2 import FileSystemBytecodeCache
 from datetime import datetime, timedelta
+from functools import lru_cache
+from io import StringIO
+from itertools import islice
+import csv
+import hashlib
 import os
+import sqlite3
+import time
 
 # Import our custom modules
 import database
 from models import (
-    Expense, Budget, Income, ExpenseCategory, IncomeSource, ExpenseAnalyzer,
-    validate_expense_data, validate_income_data, format_currency, get_date_range_description
+    ExpenseCategory, IncomeSource, ExpenseAnalyzer,
+    validate_income_data, format_currency, get_date_range_description,
+    parse_iso_date, parse_expense_form
 )
 
 """
@@ -54,18 +66,39 @@ IMPORT EXPLANATIONS:
 FROM FLASK:
 - Flask: The main application class
 - render_template: Converts HTML templates to final HTML with data
+- stream_template: Same, but sends the HTML in chunks (for long list pages)
 - request: Contains data from user's browser (form data, URL parameters)
 - redirect: Sends user to a different page
 - url_for: Generates URLs for routes (better than hardcoding URLs)
 - flash: Creates temporary messages to show users
+- get_flashed_messages: Reads (and removes) pending flash messages
 - jsonify: Converts Python dictionaries to JSON (for AJAX requests)
+- Response: Builds an HTTP response by hand (the CSV download)
+- stream_with_context: Keeps the request available while streaming
+- session: Data Flask keeps for this browser between requests (flash messages)
 
 FROM DATETIME:
 - datetime: Work with dates and times
 - timedelta: Represent time durations (e.g., 7 days ago)
 
-FROM OS:
+FROM FUNCTOOLS / ITERTOOLS:
+- lru_cache: Remembers results of a function for repeated arguments
+- islice: Takes the next N items from an iterator (CSV export batches)
+
+FROM JINJA2:
+- FileSystemBytecodeCache: Stores compiled templates on disk (see below)
+
+FROM CSV / IO:
+- csv: Module for reading/writing CSV files
+- StringIO: Creates a file-like object in memory (no disk write needed)
+
+FROM HASHLIB:
+- hashlib: Turns a text into a short fingerprint (for page ETags)
+
+FROM OS / SQLITE3 / TIME:
 - os: Operating system functions (we'll use for environment variables)
+- sqlite3: Only for catching sqlite3.Error (all queries live in database.py)
+- time: Cheap monotonic clock (for caching the current year)
 
 FROM OUR MODULES:
 - database: Our database operations (add_expense, get_all_expenses, etc.)
@@ -107,7 +140,7 @@ Mac/Linux: export SECRET_KEY=your-random-secret-key
 """
 
 # Configuration settings
-app.config['DATABASE_NAME'] = 'finance.db'
+app.config['DATABASE_NAME'] = database.DATABASE_NAME  # read-only mirror, see below
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload size
 
 """
@@ -117,33 +150,132 @@ app.config is a dictionary storing configuration values.
 MAX_CONTENT_LENGTH:
 Limits upload size to prevent users from crashing server with huge uploads.
 16 * 1024 * 1024 = 16 megabytes (1024 bytes = 1 KB, 1024 KB = 1 MB)
+
+DATABASE_NAME:
+The database module owns the file name (database.DATABASE_NAME) and uses
+its module constant directly - nothing reads app.config during a request.
+We copy it into app.config only so it shows up with the other settings
+(and in the startup banner). Previously this was a second hard-coded
+'finance.db' that could silently drift from the one actually used.
+"""
+
+# Cache compiled templates on disk so each worker process (and each restart)
+# can skip parsing/compiling the Jinja2 source on its first render.
+# No directory given: Jinja2 picks a private folder for the current user.
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+"""
+TEMPLATE BYTECODE CACHE:
+Jinja2 turns every template into Python code before it can render it.
+That compile step is slow compared to rendering, and normally happens again
+in every worker process after every restart.
+
+FileSystemBytecodeCache saves the compiled code to a temp folder. Other
+workers (and the next restart) load it from disk instead of recompiling.
+Jinja2 checks the template's modification time, so editing a template
+still invalidates its cache entry.
+
+WHY NOT OUR OWN FOLDER IN /tmp?
+Loading cached bytecode means RUNNING it. A fixed name like
+/tmp/finance_jinja_cache could be created first by another user on the
+same machine, who could then put their own code in it. Without a
+directory argument Jinja2 uses a per-user folder (_jinja2-cache-<uid>),
+creates it readable only by us (mode 0700), and refuses to use it if
+someone else owns it.
+
+AUTO RELOAD:
+We don't touch app.jinja_env.auto_reload here. Flask already ties it to
+debug mode: app.run(debug=True) re-checks templates on every render (handy
+while developing), production (debug off) does not.
 """
 
+def preload_templates():
+    """
+    Loads (compiles) every template now instead of on its first request.
+
+    Jinja2 compiles a template the first time it is used, so the first
+    visitor to each page pays that cost. Calling this at server start moves
+    the work out of request handling. Compiled templates stay in
+    jinja_env.cache (400 entries by default - far more than we have).
+
+    We call it when starting the development server below; a production
+    WSGI entry point can call it after importing `app`.
+    """
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        app.jinja_env.get_template(name)
+
+
 # ============================================================================
 # INITIALIZATION
 # ============================================================================
 
-# Initialize database on app startup
-try:
-    database.init_db()
-    print(" Database initialized successfully")
-except Exception as e:
-    print(f" Database initialization failed: {e}")
+@app.before_request
+def open_shared_connection():
+    """Lets every query in this request reuse one database connection."""
+    database.start_shared_connection()
+
+
+@app.teardown_appcontext
+def close_shared_connection(exception=None):
+    """Hands the request's database connection back (runs even after errors)."""
+    database.end_shared_connection()
 
 """
-APP STARTUP CODE:
-This runs once when the application starts.
-We initialize the database to ensure tables exist before handling requests.
+ONE CONNECTION PER REQUEST:
+The dashboard alone runs several queries. Instead of each database
+function opening and closing finance.db, they all share one connection
+until the request is finished, and then it is kept open for the next
+request (see get_db_connection in database.py).
+
+teardown_appcontext runs after the response is complete - for streamed
+pages and the CSV download that is after the last chunk was sent - and
+also when the view raised an error, so the connection is always handed
+back.
+"""
+
+# Initialize database before the first request is handled
+_db_ready = False
+
+
+@app.before_request
+def ensure_db():
+    """Creates/upgrades the database tables once, on the first request."""
+    global _db_ready
+    if _db_ready:
+        return
+    try:
+        database.init_db()
+        _db_ready = True
+        print(" Database initialized successfully")
+    except Exception as e:
+        print(f" Database initialization failed: {e}")
+
+"""
+WHY NOT AT IMPORT TIME?
+Importing app.py used to open the database and run CREATE TABLE statements.
+That meant `flask routes`, `flask --help`, test scripts, and anything else
+that merely imports this module paid for database work it never needed.
+
+@app.before_request runs before every request, but after the first success
+the flag makes it a single boolean check. init_db() itself is cheap to
+repeat: it compares the schema version stored in the file and returns
+early when nothing needs to change.
 
 TRY/EXCEPT:
-Catches initialization errors so app doesn't crash on startup.
-Prints clear error message to help with debugging.
+Catches initialization errors so app doesn't crash.
+The flag stays False, so the next request tries again.
 """
 
 # ============================================================================
 # TEMPLATE FILTERS - Custom Functions for Jinja2 Templates
 # ============================================================================
 
+@lru_cache(maxsize=2048)
+def _format_currency_cached(value):
+    """float() + format_currency(), remembered per distinct input value."""
+    return format_currency(float(value))
+
+
 @app.template_filter('currency')
 def currency_filter(value):
     """
@@ -164,10 +296,25 @@ def currency_filter(value):
         {{ 1234.56|currency }} renders as '$1,234.56'
     """
     try:
-        return format_currency(float(value))
+        return _format_currency_cached(value)
     except (ValueError, TypeError):
         return '$0.00'  # Return default if conversion fails
 
+    """
+    CACHING NOTE:
+    Money values repeat a lot on a page ($0.00, round budgets, the same
+    total in a card and a table), so the conversion is cached like
+    _format_date below. Numbers, strings and Decimals are all hashable;
+    something unhashable (a list) makes lru_cache raise TypeError, which
+    falls into the same '$0.00' fallback as before.
+    """
+
+
+@lru_cache(maxsize=4096)
+def _format_date(date_str, fmt):
+    """Parses a YYYY-MM-DD string and reformats it (cached, see below)."""
+    return parse_iso_date(date_str).strftime(fmt)
+
 
 @app.template_filter('date_format')
 def date_format_filter(date_str, format='%B %d, %Y'):
@@ -186,26 +333,346 @@ def date_format_filter(date_str, format='%B %d, %Y'):
         {{ '2025-10-01'|date_format('%m/%d/%Y') }} renders as '10/01/2025'
     """
     try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        return date_obj.strftime(format)
+        return _format_date(date_str, format)
     except (ValueError, TypeError):
         return date_str  # Return original if parsing fails
 
+    """
+    WHY _format_date IS CACHED:
+    strptime() is one of the slower functions in the standard library, and a
+    list page calls this filter once per row. Most rows share a handful of
+    dates, so @lru_cache remembers the result for each (date, format) pair
+    and skips the parsing next time.
+
+    maxsize=4096 keeps memory bounded (a few years of distinct dates).
+    Failed parses raise an exception, and exceptions are never cached.
+
+    On a cache miss, _format_date uses models.parse_iso_date (a
+    precompiled regex plus fromisoformat), which is far cheaper than
+    strptime and just as strict about the shape: exactly four, two and
+    two digits. Anything else - '2025-1-01', ' 2025-01-01', '2_25-01-01' -
+    raises ValueError, and the filter shows the original text.
+    """
+
+
+# ============================================================================
+# CACHED URL BUILDING
+# ============================================================================
+
+_URL_CACHE = {}
+
+
+def cached_url_for(endpoint, **values):
+    """
+    url_for() that remembers URLs for routes without arguments.
+
+    Every page renders the same navigation links (Dashboard, Expenses, ...).
+    Building a URL means looking up the route and formatting it, and for a
+    route with no arguments the answer never changes while the app runs.
+    So the first call stores the result and later calls reuse it.
+
+    Calls WITH arguments (edit links, static files) can produce a different
+    URL each time, so they go straight to url_for().
+
+    Usage in Templates:
+        {{ curl('index') }}                           -> cached
+        {{ curl('edit_expense', expense_id=5) }}      -> plain url_for
+    """
+    if values:
+        return url_for(endpoint, **values)
+
+    # script_root is part of the key: the same app can be mounted under
+    # different URL prefixes (e.g. /finance) and must not mix them up
+    key = (request.script_root, endpoint)
+    url = _URL_CACHE.get(key)
+    if url is None:
+        url = _URL_CACHE[key] = url_for(endpoint)
+    return url
+
+
+app.jinja_env.globals['curl'] = cached_url_for
+
+
+# ============================================================================
+# STREAMED PAGES
+# ============================================================================
+
+def stream_page(template_name, **context):
+    """
+    Like render_template(), but sends the HTML to the browser in pieces.
+
+    render_template() builds the ENTIRE page as one big string before the
+    first byte is sent. For list pages with hundreds of rows that string is
+    large, and the browser waits for all of it. stream_template() renders
+    the template chunk by chunk, so the page header (and CSS) reaches the
+    browser while the table rows are still being generated.
+
+    Args:
+        template_name: Template file to render
+        **context: Variables for the template (same as render_template)
+
+    Returns:
+        Streaming response (Flask sends each chunk as it is produced)
+    """
+    # base.html pops the flash messages from the session. A streamed body is
+    # rendered AFTER the session cookie has been sent, so that pop would be
+    # lost and the message would show up again on the next page. Reading the
+    # messages here removes them now; Flask caches them for the template.
+    get_flashed_messages(with_categories=True)
+    return stream_template(template_name, **context)
+
+
+def _code_version():
+    """Newest modification time of the Python files and templates that build the pages."""
+    template_dir = os.path.join(app.root_path, app.template_folder)
+    paths = [os.path.join(app.root_path, name) for name in ('app.py', 'database.py', 'models.py')]
+    paths += [os.path.join(template_dir, name) for name in os.listdir(template_dir)]
+    return max(os.path.getmtime(path) for path in paths)
+
+
+# The same in every worker process started from the same files, so they all
+# hand out the same ETags; changes when the code or a template is edited
+_CODE_VERSION = _code_version()
+
+
+def data_etag(*tables):
+    """
+    Returns an ETag for a page built only from `tables` (and today's date).
+
+    The value changes whenever one of the tables is written to - by any
+    process (see database.get_data_version) - the day changes, or the
+    code or templates change.
+
+    Args:
+        *tables: Table names the page reads, e.g. 'expenses', 'income'
+
+    Returns:
+        Short hex string, e.g. '3f9c0a17b2d4e851' - or None when a flash
+        message is waiting: it is part of the HTML and must be shown (and
+        removed) exactly once, so that page must not be cached. Also None
+        if the versions can't be read; the page is then just sent in full.
+    """
+    if '_flashes' in session:
+        return None
+    try:
+        versions = database.get_data_version(*tables)
+    except sqlite3.Error:
+        return None
+    key = f'{_CODE_VERSION}|{datetime.now():%Y-%m-%d}|{versions}'
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def not_modified(etag):
+    """Returns a 304 response if the browser already has version `etag`, else None."""
+    if etag is None or etag not in request.if_none_match:
+        return None
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def with_etag(body, etag):
+    """Wraps rendered HTML (or a jsonify() response) so it carries `etag`, if there is one."""
+    response = app.make_response(body)
+    if etag is not None:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+"""
+ETAGS AND 304 NOT MODIFIED:
+An ETag is a "version label" for a page. We send it with the HTML; next
+time, the browser asks "I have version X, has it changed?" (If-None-Match).
+If our label is still X we answer 304 Not Modified with no body, and the
+browser shows its saved copy - no database queries, no template rendering.
+
+Cache-Control: no-cache doesn't mean "don't cache": it means "keep a copy,
+but ask me before using it", which is exactly this check.
+
+WHY NOTHING PROCESS-SPECIFIC IN THE LABEL?
+With several worker processes, each request may land on a different one.
+The label is built only from what all of them share - the counters
+stored in finance.db and the files on disk - so every worker agrees, and
+a write made through one worker (or outside the app) changes it for all.
+
+'_flashes' is where Flask keeps messages waiting for flash(). It must be
+checked BEFORE rendering, because base.html removes the messages from
+the session while the page is rendered.
+"""
+
+
+def form_error(template_name, message, **context):
+    """
+    Shows a form again, filled in with what the user typed, plus an error.
+
+    Args:
+        template_name: The form template (add_expense.html, add_income.html)
+        message: Error to show at the top of the page
+        **context: Template variables, e.g. expense=request.form
+
+    Returns:
+        (HTML, 400) - Flask sends the page with status 400 Bad Request
+    """
+    flash(message, 'error')
+    return render_template(template_name, now=datetime.now(), **context), 400
+
+"""
+WHY NOT REDIRECT BACK TO THE FORM?
+A redirect makes the browser send a second request for an EMPTY form:
+one more round trip, and everything the user typed is gone. Rendering
+the form right away keeps their input (request.form works in the
+templates just like a database row: expense.amount, income.date, ...)
+so they only fix the one field that was wrong.
+
+Successful saves still redirect (POST-REDIRECT-GET): there a refresh
+must not submit the form a second time.
+"""
+
+
+_PAGE_SIZE = 50  # Rows per page on the expense and income lists
+
+
+def page_window(total_count):
+    """
+    Reads ?page=N and works out which rows of a long list to show.
+
+    Args:
+        total_count: How many rows the whole (filtered) list has
+
+    Returns:
+        Tuple of (offset, pager):
+        - offset: Rows to skip, for database.get_*_page()
+        - pager: {'page', 'pages', 'prev_url', 'next_url'} for the template;
+          the URLs keep the other query parameters (filters) and are None
+          on the first / last page
+    """
+    pages = max(1, -(-total_count // _PAGE_SIZE))  # Round up
+    page = min(max(request.args.get('page', 1, type=int), 1), pages)
+
+    args = request.args.to_dict()
+
+    def link(number):
+        if not 1 <= number <= pages:
+            return None
+        return url_for(request.endpoint, **{**args, 'page': number})
+
+    pager = {
+        'page': page,
+        'pages': pages,
+        'prev_url': link(page - 1),
+        'next_url': link(page + 1),
+    }
+    return (page - 1) * _PAGE_SIZE, pager
+
+"""
+PAGINATION:
+Showing every record ever stored makes the list pages slower (and the
+HTML bigger) with each month of data. Instead each page shows 50 rows,
+fetched with LIMIT/OFFSET, and the totals above the table come from SQL
+so they still describe ALL matching records.
+
+request.args.get('page', 1, type=int) returns 1 for a missing or
+non-numeric value ('?page=abc'), and the min/max clamp keeps '?page=0'
+or '?page=999' inside the real range.
+"""
+
 
 # ============================================================================
 # CONTEXT PROCESSORS - Variables Available in All Templates
 # ============================================================================
 
+# Categories and income sources are defined by enums in models.py, so they
+# never change while the app is running. Build the template values ONCE at
+# import time instead of rebuilding the same lists/dicts on every render.
+_CATEGORIES = ExpenseCategory.get_all_categories()
+_CATEGORY_COLORS = ExpenseCategory.get_category_dict()
+_INCOME_SOURCES = IncomeSource.get_all_sources()
+_INCOME_SOURCE_COLORS = IncomeSource.get_source_dict()
+_UNKNOWN_CATEGORY_COLOR = '#BDC3C7'  # Gray, for categories without a color
+
+_EXPENSE_CTX = {
+    'categories': _CATEGORIES,
+    'category_colors': _CATEGORY_COLORS,
+}
+_INCOME_CTX = {
+    'income_sources': _INCOME_SOURCES,
+    'income_source_colors': _INCOME_SOURCE_COLORS,
+}
+
+# Which pages actually use the dropdown/color data (keyed by endpoint, i.e.
+# the name of the route function). Every other page gets none of it.
+_CTX_BY_ENDPOINT = {
+    'add_expense': _EXPENSE_CTX,
+    'edit_expense': _EXPENSE_CTX,
+    'view_expenses': _EXPENSE_CTX,
+    'manage_budgets': _EXPENSE_CTX,
+    'add_income': _INCOME_CTX,
+    'edit_income': _INCOME_CTX,
+    'view_income': _INCOME_CTX,
+}
+_NO_CTX = {}
+
+
+def _wants_json():
+    """True for API calls, JSON posts, and AJAX / JSON-only clients."""
+    return (request.path.startswith('/api/')
+            or request.is_json
+            or request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+            or request.accept_mimetypes.best == 'application/json')
+
+
+# [year, monotonic time it was read]; see _current_year()
+_year_cache = [0, float('-inf')]
+
+
+def _current_year():
+    """
+    Returns the current year, re-reading the clock at most once an hour.
+
+    The footer shows the year on every page, but the year only changes once
+    a year. Checking a cheap monotonic timer is faster than building a full
+    datetime for every render; after New Year's the footer catches up
+    within an hour.
+    """
+    now = time.monotonic()
+    if now - _year_cache[1] > 3600:
+        _year_cache[0] = datetime.now().year
+        _year_cache[1] = now
+    return _year_cache[0]
+
+
+# Finished context dicts (page data + current_year), rebuilt only when the
+# year changes. See _build_page_contexts() and inject_categories().
+_ctx_year = None
+_ctx_by_endpoint = {}
+_ctx_default = {}
+
+
+def _build_page_contexts(year):
+    """Builds one ready-to-return context dict per page group for `year`."""
+    global _ctx_year, _ctx_by_endpoint, _ctx_default
+    expense_ctx = {**_EXPENSE_CTX, 'current_year': year}
+    income_ctx = {**_INCOME_CTX, 'current_year': year}
+    _ctx_by_endpoint = {
+        endpoint: expense_ctx if group is _EXPENSE_CTX else income_ctx
+        for endpoint, group in _CTX_BY_ENDPOINT.items()
+    }
+    _ctx_default = {**_NO_CTX, 'current_year': year}
+    _ctx_year = year
+
+
 @app.context_processor
 def inject_categories():
     """
-    Makes expense categories and income sources available to all templates.
+    Makes expense categories and income sources available to the templates that use them.
 
     CONTEXT PROCESSORS:
     Functions decorated with @app.context_processor run before rendering any template.
-    They return a dictionary of variables that become available in ALL templates.
+    They return a dictionary of variables that become available in the template.
 
-    This means every template can access 'categories' and 'income_sources' without us passing them explicitly.
+    Expense pages (forms, list, budgets) get 'categories', income pages get
+    'income_sources', without us passing them explicitly. The lookup is by
+    request.endpoint - see _CTX_BY_ENDPOINT above.
 
     Returns:
         Dict with variables to inject into template context
@@ -219,13 +686,14 @@ def inject_categories():
             <option>{{ source }}</option>
         {% endfor %}
     """
-    return {
-        'categories': ExpenseCategory.get_all_categories(),
-        'category_colors': ExpenseCategory.get_category_dict(),
-        'income_sources': IncomeSource.get_all_sources(),
-        'income_source_colors': IncomeSource.get_source_dict(),
-        'current_year': datetime.now().year
-    }
+    # JSON and AJAX requests don't get a page, so skip all of the below
+    if _wants_json():
+        return _NO_CTX
+
+    year = _current_year()
+    if year != _ctx_year:
+        _build_page_contexts(year)
+    return _ctx_by_endpoint.get(request.endpoint, _ctx_default)
 
     """
     INJECTED VARIABLES:
@@ -238,6 +706,30 @@ def inject_categories():
     JUNIOR DEV NOTE:
     By adding these to the context processor, we don't have to pass them
     manually to every single template. They're automatically available!
+
+    PERFORMANCE NOTE:
+    This function runs before EVERY template render, so it should be cheap.
+    The category/source values are precomputed once (they come from enums
+    and never change); current_year comes from _current_year().
+    Pages that never show a dropdown (dashboard, analytics, error pages)
+    only get current_year, which keeps their template context small.
+
+    The returned dicts are built ahead of time by _build_page_contexts()
+    and only rebuilt when the year changes, so a normal call allocates
+    nothing. Returning a shared dict is safe: Flask copies the values
+    into each render's own context and never modifies what we return.
+
+    JSON / AJAX REQUESTS:
+    If anything renders a template (e.g. an error page) while answering an
+    /api/ call, a JSON post, or an XMLHttpRequest, nobody reads the page
+    chrome, so we return an empty dict without looking at the year or the
+    endpoint. Those pages then have no current_year; Jinja2 just prints
+    nothing for it.
+
+    ADDING A NEW PAGE?
+    If its template loops over categories or income_sources, add its
+    endpoint to _CTX_BY_ENDPOINT - otherwise the variable is undefined.
+    (analytics passes its own category_colors list explicitly.)
     """
 
 
@@ -271,31 +763,32 @@ def index():
     Template: templates/index.html
     """
 
-    # Get all expenses from database
-    expense_dicts = database.get_all_expenses()
-    expenses = [Expense.from_dict(exp) for exp in expense_dicts]
+    # Nothing written since the browser's copy? Then it's still correct.
+    etag = data_etag('expenses', 'income')
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-    # Get all income from database
-    income_dicts = database.get_all_income()
-    income_records = [Income.from_dict(inc) for inc in income_dicts]
+    # Totals for both sides are calculated by SQLite (SUM/COUNT/GROUP BY) in
+    # one query, so we never load every expense and income row to add them up
+    expense_summary, income_summary = database.get_dashboard_snapshot()
+    total_expenses_count, total_expenses_amount, category_totals = expense_summary
+    total_income_count, total_income_amount, _ = income_summary
 
     """
     COMPLETE FINANCIAL PICTURE:
-    We now fetch both expenses AND income.
+    We fetch totals for both expenses AND income.
     This lets us show:
     - How much money is coming IN (income)
     - How much money is going OUT (expenses)
     - The difference (savings or deficit)
-    """
 
-    # Calculate expense statistics
-    total_expenses_count = len(expenses)
-    total_expenses_amount = ExpenseAnalyzer.calculate_total(expenses)
-    category_totals = ExpenseAnalyzer.get_category_totals(expenses)
-
-    # Calculate income statistics
-    total_income_count = len(income_records)
-    total_income_amount = sum(inc.amount for inc in income_records)
+    WHY NOT LOAD EVERYTHING?
+    The dashboard only displays totals plus the 5 newest rows of each.
+    Loading thousands of rows into Python objects just to sum them (and then
+    show five) was most of this page's cost. The database does the adding
+    in C, and we fetch exactly the 5 rows we show (see below).
+    """
 
     # Calculate net savings and savings rate
     net_savings = total_income_amount - total_expenses_amount
@@ -353,9 +846,10 @@ def index():
     Otherwise savings rate defaults to 0.
     """
 
-    # Get recent transactions (5 expenses + 5 income)
-    recent_expenses = expenses[:5] if expenses else []
-    recent_income = income_records[:5] if income_records else []
+    # Get recent transactions (5 expenses + 5 income) - LIMIT 5 in SQL
+    # Plain rows: the template only reads fields, like view_expenses
+    recent_expenses = database.get_recent_expenses(5)
+    recent_income = database.get_recent_income(5)
 
     """
     RECENT ACTIVITY:
@@ -364,7 +858,7 @@ def index():
     """
 
     # Render template with data
-    return render_template(
+    return with_etag(render_template(
         'index.html',
         expenses=recent_expenses,
         total_expenses=total_expenses_count,
@@ -376,7 +870,7 @@ def index():
         net_savings=net_savings,
         savings_rate=savings_rate,
         is_deficit=is_deficit
-    )
+    ), etag)
 
     """
     TEMPLATE VARIABLES:
@@ -435,11 +929,11 @@ def add_expense():
         POST means user submitted a form.
         """
 
-        # Get form data
-        date = request.form.get('date', '')
-        category = request.form.get('category', '')
-        amount_str = request.form.get('amount', '0')
-        description = request.form.get('description', '')
+        # Read, convert and validate the form in one step
+        expense, error_message = parse_expense_form(request.form)
+
+        if expense is None:
+            return form_error('add_expense.html', error_message, expense=request.form)
 
         """
         REQUEST.FORM:
@@ -448,53 +942,30 @@ def add_expense():
 
         <input name="amount">  request.form.get('amount')
 
-        .get(key, default):
-        Returns value if key exists, otherwise returns default.
-        This prevents KeyError if field is missing.
-        """
-
-        # Convert amount to float
-        try:
-            amount = float(amount_str)
-        except ValueError:
-            flash('Amount must be a valid number', 'error')
-            return redirect(url_for('add_expense'))
-
-        """
-        TYPE CONVERSION WITH ERROR HANDLING:
-        User input comes as strings. We need to convert '25.50' to 25.50
-        If conversion fails (user entered 'abc'), catch error and show message.
+        PARSE_EXPENSE_FORM (models.py):
+        User input always arrives as strings. It converts '25.50' to 25.50
+        and runs validate_expense_data, which checks:
+        - Date format is correct
+        - Category is valid
+        - Amount is positive
+        - Description isn't too long
+        It returns a ready Expense, or None plus a message to show.
 
-        FLASH:
-        flash(message, category) creates a temporary message.
-        'error' category styles message as error (red)
-        Other categories: 'success', 'warning', 'info'
+        FORM_ERROR:
+        Shows the form again with the user's input and the message (see
+        form_error). flash(message, category) creates a temporary message;
+        'error' styles it red. Other categories: 'success', 'warning', 'info'
 
         URL_FOR:
         url_for('add_expense') generates URL for add_expense function.
         Better than hardcoding '/add' because if we change route, URL updates automatically.
         """
 
-        # Validate data
-        is_valid, error_message = validate_expense_data(date, category, amount, description)
-
-        if not is_valid:
-            flash(error_message, 'error')
-            return redirect(url_for('add_expense'))
-
-        """
-        VALIDATION:
-        Always validate before saving to database!
-        Our validate_expense_data function checks:
-        - Date format is correct
-        - Category is valid
-        - Amount is positive
-        - Description isn't too long
-        """
-
         # Save to database
         try:
-            expense_id = database.add_expense(date, category, amount, description)
+            expense_id = database.add_expense(
+                expense.date, expense.category, expense.amount, expense.description
+            )
             flash(f'Expense added successfully! (ID: {expense_id})', 'success')
             return redirect(url_for('index'))
 
@@ -510,8 +981,8 @@ def add_expense():
             """
 
         except Exception as e:
-            flash(f'Error adding expense: {str(e)}', 'error')
-            return redirect(url_for('add_expense'))
+            return form_error('add_expense.html', f'Error adding expense: {str(e)}',
+                              expense=request.form)
 
             """
             ERROR HANDLING:
@@ -567,10 +1038,11 @@ def view_expenses():
     - request.args: Data from URL parameters (query string)
     """
 
-    # Fetch expenses based on filters
+    # Work out which filter applies (invalid ones fall back to no filter)
+    filters = ()
     if category_filter:
         # Filter by category (e.g., show only "Food & Dining" expenses)
-        expense_dicts = database.get_expenses_by_category(category_filter)
+        filters = (category_filter,)
 
     elif start_date and end_date:
         # Validate date range before querying database
@@ -584,44 +1056,42 @@ def view_expenses():
         would return no results and confuse the user.
         """
         try:
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+            start_dt = parse_iso_date(start_date)
+            end_dt = parse_iso_date(end_date)
 
             if start_dt > end_dt:
                 # Dates are backwards - show error and fall back to all expenses
                 flash('Start date must be before or equal to end date', 'error')
-                expense_dicts = database.get_all_expenses()
             else:
                 # Valid date range - fetch filtered expenses
-                expense_dicts = database.get_expenses_by_date_range(start_date, end_date)
+                filters = ('', start_date, end_date)
 
         except ValueError:
             # Invalid date format (e.g., '2025-13-45' or 'not-a-date')
             flash('Invalid date format', 'error')
-            expense_dicts = database.get_all_expenses()
-
-    else:
-        # No filters applied - show all expenses
-        expense_dicts = database.get_all_expenses()
 
     """
     CONDITIONAL FILTERING:
-    Check what filters user applied and call appropriate database function.
-    If no filters, get all expenses.
+    Check what filters user applied; `filters` holds the arguments for
+    the database functions (category, start_date, end_date). If no
+    filters, it stays empty and we get all expenses.
     """
 
-    # Convert to Expense objects
-    expenses = [Expense.from_dict(exp) for exp in expense_dicts]
+    # Count and total of ALL matching expenses, added up by SQLite...
+    total_count, total_amount = database.get_expense_totals(*filters)
 
-    # Calculate statistics for filtered data
-    total_amount = ExpenseAnalyzer.calculate_total(expenses)
-    category_totals = ExpenseAnalyzer.get_category_totals(expenses)
+    # ...but only one page of rows. The template only reads fields
+    # (expense.date, expense.amount, ...), and Jinja2 reads dictionary keys
+    # with the same dot syntax - so the rows go to the template as-is.
+    offset, pager = page_window(total_count)
+    expenses = database.get_expense_page(_PAGE_SIZE, offset, *filters)
 
-    return render_template(
+    return stream_page(
         'view_expenses.html',
         expenses=expenses,
+        total_count=total_count,
         total_amount=total_amount,
-        category_totals=category_totals,
+        pager=pager,
         category_filter=category_filter,
         start_date=start_date,
         end_date=end_date,
@@ -631,11 +1101,14 @@ def view_expenses():
     )
 
     """
+    STREAMING:
+    stream_page() sends the page in chunks (see its docstring).
+
     PASSING DATA TO TEMPLATE:
 
-    expenses: Filtered list of Expense objects to display
-    total_amount: Sum of all filtered expenses (for statistics)
-    category_totals: Dictionary of spending by category
+    expenses: This page's expense rows (dicts) to display
+    total_count / total_amount: Count and sum of ALL filtered expenses
+    pager: Page number and previous/next links (see page_window)
     category_filter: Current category filter (to pre-select dropdown)
     start_date/end_date: Current date filters (to pre-fill date inputs)
     now: Current datetime object (for quick filter buttons like "This Month")
@@ -676,8 +1149,8 @@ def edit_expense(expense_id):
         POST: Redirect after successful update
     """
 
-    # Get expense from database
-    expense_dict = database.get_expense_by_id(expense_id)
+    # Get expense from database (ids start at 1, so 0 can't exist - skip the query)
+    expense_dict = database.get_expense_by_id(expense_id) if expense_id > 0 else None
 
     if not expense_dict:
         flash(f'Expense {expense_id} not found', 'error')
@@ -692,31 +1165,22 @@ def edit_expense(expense_id):
     Never assume data exists. Always check and handle missing data gracefully.
     """
 
-    expense = Expense.from_dict(expense_dict)
-
     if request.method == 'POST':
-        # Get updated data from form
-        date = request.form.get('date', '')
-        category = request.form.get('category', '')
-        amount_str = request.form.get('amount', '0')
-        description = request.form.get('description', '')
-
-        # Convert and validate
-        try:
-            amount = float(amount_str)
-        except ValueError:
-            flash('Amount must be a valid number', 'error')
-            return redirect(url_for('edit_expense', expense_id=expense_id))
+        # Read, convert and validate the updated form (same rules as adding)
+        expense, error_message = parse_expense_form(request.form)
 
-        is_valid, error_message = validate_expense_data(date, category, amount, description)
+        # Typed values, plus the id the form needs for its action URL
+        submitted = {**request.form.to_dict(), 'id': expense_id}
 
-        if not is_valid:
-            flash(error_message, 'error')
-            return redirect(url_for('edit_expense', expense_id=expense_id))
+        if expense is None:
+            return form_error('add_expense.html', error_message,
+                              expense=submitted, edit_mode=True)
 
         # Update database
         try:
-            success = database.update_expense(expense_id, date, category, amount, description)
+            success = database.update_expense(
+                expense_id, expense.date, expense.category, expense.amount, expense.description
+            )
 
             if success:
                 flash('Expense updated successfully!', 'success')
@@ -726,13 +1190,13 @@ def edit_expense(expense_id):
                 return redirect(url_for('edit_expense', expense_id=expense_id))
 
         except Exception as e:
-            flash(f'Error updating expense: {str(e)}', 'error')
-            return redirect(url_for('edit_expense', expense_id=expense_id))
+            return form_error('add_expense.html', f'Error updating expense: {str(e)}',
+                              expense=submitted, edit_mode=True)
 
     # GET request - show form with current data
     return render_template(
         'add_expense.html',
-        expense=expense,
+        expense=expense_dict,
         edit_mode=True,
         now=datetime.now()
         # Note: categories already available via context processor
@@ -743,7 +1207,9 @@ def edit_expense(expense_id):
     We reuse add_expense.html for editing by passing expense and edit_mode.
 
     PARAMETERS PASSED:
-    - expense: Current expense data to pre-fill form
+    - expense: Current expense data to pre-fill form (the plain dict from
+      the database - the template only reads fields, so there is no need
+      to build an Expense object first)
     - edit_mode: Boolean flag (True) so template knows we're editing
     - categories: List of all valid categories for dropdown
 
@@ -780,7 +1246,8 @@ def delete_expense_route(expense_id):
     """
 
     try:
-        success = database.delete_expense(expense_id)
+        # ids start at 1 (<int:...> already rules out negative numbers)
+        success = expense_id > 0 and database.delete_expense(expense_id)
 
         if success:
             flash('Expense deleted successfully!', 'success')
@@ -815,7 +1282,6 @@ def manage_budgets():
         GET: Budget management page
         POST: Redirect after setting budget
     """
-
     if request.method == 'POST':
         category = request.form.get('category', '')
         limit_str = request.form.get('monthly_limit', '0')
@@ -840,26 +1306,21 @@ def manage_budgets():
         return redirect(url_for('manage_budgets'))
 
     # GET request - show budgets page
-    budget_dicts = database.get_all_budgets()
-    budgets = [Budget.from_dict(b) for b in budget_dicts]
+    budgets = database.get_all_budgets()
 
-    # Get current month expenses for budget comparison
+    # Calculate budget status for the current month (one cached SQL query)
     now = datetime.now()
-    expense_dicts = database.get_all_expenses()
-    expenses = [Expense.from_dict(exp) for exp in expense_dicts]
-
-    # Calculate budget status
-    budget_status = ExpenseAnalyzer.get_budget_status(
-        expenses, budgets, now.year, now.month
-    )
+    budget_status = database.get_budget_status(now.year, now.month)
 
     """
     BUDGET STATUS:
     Shows how much of each budget has been used this month.
-    ExpenseAnalyzer.get_budget_status calculates:
+    database.get_budget_status calculates:
     - Amount spent vs budget limit
     - Percentage used
     - Whether over budget
+    SQLite adds up the month's spending and joins it to the budgets, so
+    no expenses are loaded into Python at all.
     """
 
     return render_template(
@@ -901,19 +1362,30 @@ def analytics():
         Rendered analytics template with chart data
     """
 
-    # Get all expenses
-    expense_dicts = database.get_all_expenses()
-    expenses = [Expense.from_dict(exp) for exp in expense_dicts]
+    # Same page as last time unless an expense was written (see index)
+    etag = data_etag('expenses')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    # Count, total and per-category totals in one (cached) query
+    expense_count, total_spent, category_totals = database.get_expense_summary()
 
-    if not expenses:
+    if not expense_count:
         flash('No expenses to analyze yet. Add some expenses first!', 'info')
         return redirect(url_for('index'))
 
-    # Calculate category totals for pie chart
-    category_totals = ExpenseAnalyzer.get_category_totals(expenses)
+    # Spending per month over the last 6 months, for the line chart
+    trend_start, trend_end = ExpenseAnalyzer.get_trend_window(months=6)
+    spending_trend = database.get_monthly_totals(trend_start, trend_end)
 
-    # Get spending trend for line chart
-    spending_trend = ExpenseAnalyzer.get_spending_trend(expenses, months=6)
+    """
+    AGGREGATING IN SQL:
+    Every number on this page is a SUM or COUNT, so SQLite computes them
+    (from the pre-added daily_totals table) and we only receive the
+    results - a few dozen values instead of every expense ever recorded
+    turned into Expense objects and looped over three times.
+    """
 
     """
     CHART DATA:
@@ -929,14 +1401,16 @@ def analytics():
     # Prepare chart data
     category_labels = list(category_totals.keys())
     category_values = list(category_totals.values())
-    category_colors_map = ExpenseCategory.get_category_dict()
-    category_colors = [category_colors_map.get(cat, '#BDC3C7') for cat in category_labels]
+    category_colors = [_CATEGORY_COLORS.get(cat, _UNKNOWN_CATEGORY_COLOR)
+                       for cat in category_labels]
 
     """
     LIST COMPREHENSION WITH GET:
-    [category_colors_map.get(cat, default) for cat in category_labels]
+    [_CATEGORY_COLORS.get(cat, default) for cat in category_labels]
 
-    For each category, look up its color. If not found, use gray (#BDC3C7).
+    For each category, look up its color. If not found (e.g. a category
+    that was renamed in models.py), use gray. _CATEGORY_COLORS is the
+    color table built once at import time (see inject_categories).
     """
 
     # Prepare trend data
@@ -944,14 +1418,16 @@ def analytics():
     trend_values = list(spending_trend.values())
 
     # Calculate summary statistics
-    total_spent = ExpenseAnalyzer.calculate_total(expenses)
-    average_expense = ExpenseAnalyzer.calculate_average(expenses)
+    average_expense = total_spent / expense_count
 
     # Get current month spending
     now = datetime.now()
-    current_month_total = ExpenseAnalyzer.get_monthly_total(expenses, now.year, now.month)
+    month_key = f"{now.year}-{now.month:02d}"
+    current_month_total = database.get_monthly_totals(
+        f"{month_key}-01", f"{month_key}-31"
+    ).get(month_key, 0.0)
 
-    return render_template(
+    return with_etag(render_template(
         'analytics.html',
         category_labels=category_labels,
         category_values=category_values,
@@ -961,13 +1437,20 @@ def analytics():
         total_spent=total_spent,
         average_expense=average_expense,
         current_month_total=current_month_total
-    )
+    ), etag)
 
 
 # ----------------------------------------------------------------------------
 # EXPORT DATA
 # ----------------------------------------------------------------------------
 
+_CSV_BATCH_SIZE = 500  # Expense rows per chunk of the CSV download
+
+# The header never changes, so it's written out once here. \r\n is the line
+# ending csv.writer uses, so the header matches the rows below it.
+_CSV_HEADER = 'ID,Date,Category,Amount,Description,Created At\r\n'
+
+
 @app.route('/export')
 def export_csv():
     """
@@ -978,76 +1461,71 @@ def export_csv():
     Returns:
         CSV file download
     """
-    import csv
-    from io import StringIO
-    from flask import make_response
-
-    """
-    ADDITIONAL IMPORTS:
-    Imported inside function since only needed here.
-    - csv: Module for reading/writing CSV files
-    - StringIO: Creates a file-like object in memory (no disk write needed)
-    - make_response: Creates custom HTTP response
-    """
-
-    # Get all expenses
-    expense_dicts = database.get_all_expenses()
-
-    # Create CSV in memory
-    output = StringIO()
-    writer = csv.writer(output)
-
-    """
-    STRING IO:
-    StringIO creates a file-like object that writes to memory instead of disk.
-    Faster and simpler than creating temporary files.
-    """
-
-    # Write header row
-    writer.writerow(['ID', 'Date', 'Category', 'Amount', 'Description', 'Created At'])
-
-    # Write expense rows
-    for expense in expense_dicts:
-        writer.writerow([
-            expense['id'],
-            expense['date'],
-            expense['category'],
-            expense['amount'],
-            expense['description'],
-            expense['created_at']
-        ])
+    def generate():
+        # Header row - a fixed string, sent before the database is touched
+        yield _CSV_HEADER
+
+        # One small reusable buffer: the csv module writes a batch of lines
+        # into it, we send them, then empty the buffer for the next batch
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+
+        # Write expense rows (already in column order, see iter_all_expenses)
+        # in batches: writerows() loops over a whole batch in C
+        rows = database.iter_all_expenses()
+        while True:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(islice(rows, _CSV_BATCH_SIZE))
+            chunk = buffer.getvalue()
+            if not chunk:
+                break
+            yield chunk
+
+    """
+    STREAMING THE FILE:
+    The old version loaded every expense, wrote the whole CSV into memory,
+    and then copied it into the response - twice the size of the file in
+    memory, and the download couldn't start until all of it was built.
+
+    Now generate() is a generator: Flask sends the file to the browser in
+    pieces as soon as they are produced, and database.iter_all_expenses()
+    reads rows from SQLite one at a time. Memory use stays the same for 10
+    or 100,000 rows.
+
+    BATCHES:
+    islice(rows, 500) takes the next (up to) 500 rows from the iterator.
+    writer.writerows() writes them all in one call, and we send them as one
+    chunk - far fewer Python-level steps (and network writes) than one
+    writerow() + yield per expense. An empty chunk means the rows ran out.
+
+    WHY STILL USE csv.writer?
+    Descriptions may contain commas, quotes or newlines. csv.writer adds
+    the correct quoting; a plain ','.join() would produce a broken file.
 
-    """
     CSV FORMAT:
-    Each writerow() creates one line in CSV file:
+    One line per expense, after the fixed header line:
     ID,Date,Category,Amount,Description,Created At
     1,2025-10-01,Food & Dining,25.50,Lunch,2025-10-01 10:30:00
     """
 
-    # Create response
-    output.seek(0)  # Move to start of StringIO object
-
-    """
-    SEEK(0):
-    After writing, we're at the end of the file.
-    seek(0) moves back to the beginning so we can read it.
-    """
-
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = f'attachment; filename=expenses_{datetime.now().strftime("%Y%m%d")}.csv'
+    now = datetime.now()
+    filename = f'expenses_{now.year}{now.month:02d}{now.day:02d}.csv'
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
     """
     HTTP HEADERS:
-    - Content-Type: Tells browser what kind of file this is
+    - Content-Type (mimetype): Tells browser what kind of file this is
     - Content-Disposition: Tells browser to download (not display) file
     - filename: What to name the downloaded file
 
     Result: File downloads as expenses_20251001.csv
     """
 
-    return response
-
 
 # ============================================================================
 # INCOME TRACKING ROUTES
@@ -1076,46 +1554,21 @@ def view_income():
     - Could add filtering later (by source, date range, etc.)
     - For now, showing all income sorted by date
     """
-    # Get all income from database
-    income_dicts = database.get_all_income()
-
-    # Convert dictionaries to Income objects
-    income_records = [Income.from_dict(inc) for inc in income_dicts]
+    # Count and total of ALL records are added up by SQLite - the page
+    # itself only holds one page of them
+    total_records, total_income = database.get_income_totals()
 
-    # Calculate total income
-    total_income = sum(inc.amount for inc in income_records)
+    # The table shows one page of records, passed on as they are, without
+    # an Income object per row (the template reads inc.amount from a dict)
+    offset, pager = page_window(total_records)
+    income_records = database.get_income_page(_PAGE_SIZE, offset)
 
-    # Count total records
-    total_records = len(income_records)
-
-    # Get income by source (for statistics)
-    income_by_source = {}
-    for inc in income_records:
-        source = inc.source
-        if source in income_by_source:
-            income_by_source[source] += inc.amount
-        else:
-            income_by_source[source] = inc.amount
-
-    """
-    GROUPING BY SOURCE:
-    We loop through all income and group by source.
-    This shows how much came from each source (Salary, Freelance, etc.)
-
-    Example result:
-    {
-        'Salary': 15000.00,
-        'Freelance': 3500.00,
-        'Gift': 500.00
-    }
-    """
-
-    return render_template(
+    return stream_page(
         'view_income.html',
         income_records=income_records,
         total_income=total_income,
         total_records=total_records,
-        income_by_source=income_by_source
+        pager=pager
     )
 
 
@@ -1130,7 +1583,8 @@ def add_income():
 
     Returns:
         GET: Rendered form template
-        POST: Redirect to income list with success message
+        POST: Redirect to income list with success message, or the form
+              again (with the typed values) if something is wrong
 
     JUNIOR DEV NOTES:
     - Almost identical to add_expense() but for income
@@ -1148,15 +1602,14 @@ def add_income():
         try:
             amount = float(amount_str)
         except ValueError:
-            flash('Amount must be a valid number', 'error')
-            return redirect(url_for('add_income'))
+            return form_error('add_income.html', 'Amount must be a valid number',
+                              income=request.form)
 
         # Validate data using new validation function
         is_valid, error_message = validate_income_data(date, source, amount, description)
 
         if not is_valid:
-            flash(error_message, 'error')
-            return redirect(url_for('add_income'))
+            return form_error('add_income.html', error_message, income=request.form)
 
         """
         VALIDATION:
@@ -1175,8 +1628,8 @@ def add_income():
             return redirect(url_for('view_income'))
 
         except Exception as e:
-            flash(f'Error adding income: {str(e)}', 'error')
-            return redirect(url_for('add_income'))
+            return form_error('add_income.html', f'Error adding income: {str(e)}',
+                              income=request.form)
 
     # GET request - show the form
     return render_template('add_income.html', now=datetime.now())
@@ -1206,8 +1659,6 @@ def edit_income(income_id):
         flash(f'Income record {income_id} not found', 'error')
         return redirect(url_for('view_income'))
 
-    income = Income.from_dict(income_dict)
-
     if request.method == 'POST':
         # Get updated data from form
         date = request.form.get('date', '')
@@ -1215,19 +1666,22 @@ def edit_income(income_id):
         amount_str = request.form.get('amount', '0')
         description = request.form.get('description', '')
 
+        # Typed values, plus the id the form needs for its action URL
+        submitted = {**request.form.to_dict(), 'id': income_id}
+
         # Convert and validate
         try:
             amount = float(amount_str)
         except ValueError:
-            flash('Amount must be a valid number', 'error')
-            return redirect(url_for('edit_income', income_id=income_id))
+            return form_error('add_income.html', 'Amount must be a valid number',
+                              income=submitted, edit_mode=True)
 
         # Validate data using validation function
         is_valid, error_message = validate_income_data(date, source, amount, description)
 
         if not is_valid:
-            flash(error_message, 'error')
-            return redirect(url_for('edit_income', income_id=income_id))
+            return form_error('add_income.html', error_message,
+                              income=submitted, edit_mode=True)
 
         # Update database
         try:
@@ -1241,13 +1695,13 @@ def edit_income(income_id):
                 return redirect(url_for('edit_income', income_id=income_id))
 
         except Exception as e:
-            flash(f'Error updating income: {str(e)}', 'error')
-            return redirect(url_for('edit_income', income_id=income_id))
+            return form_error('add_income.html', f'Error updating income: {str(e)}',
+                              income=submitted, edit_mode=True)
 
     # GET request - show form with current data
     return render_template(
         'add_income.html',
-        income=income,
+        income=income_dict,  # The form only reads fields (income.date, ...)
         edit_mode=True,
         now=datetime.now()
     )
@@ -1313,6 +1767,12 @@ def api_category_totals():
         JSON response with category totals
     """
 
+    # Charts poll this: answer 304 while no expense has been written
+    etag = data_etag('expenses')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
     category_totals = database.get_category_totals()
 
     """
@@ -1321,7 +1781,7 @@ def api_category_totals():
     {'Food': 250.50} becomes '{"Food": 250.50}'
     """
 
-    return jsonify(category_totals)
+    return with_etag(jsonify(category_totals), etag)
 
 
 @app.route('/api/monthly-trend/<int:months>')
@@ -1336,12 +1796,19 @@ def api_monthly_trend(months):
         JSON response with monthly totals
     """
 
-    expense_dicts = database.get_all_expenses()
-    expenses = [Expense.from_dict(exp) for exp in expense_dicts]
+    # The window ends today, and data_etag includes the date - so a cached
+    # answer is only reused on the same day, with no expense written since
+    etag = data_etag('expenses')
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-    trend = ExpenseAnalyzer.get_spending_trend(expenses, months=months)
+    # Same window as get_spending_trend, but SQLite adds up the months
+    # (GROUP BY month over daily_totals, cached until the next write)
+    trend_start, trend_end = ExpenseAnalyzer.get_trend_window(months=months)
+    trend = database.get_monthly_totals(trend_start, trend_end)
 
-    return jsonify(trend)
+    return with_etag(jsonify(trend), etag)
 
 
 # ============================================================================
@@ -1412,6 +1879,8 @@ if __name__ == '__main__':
     print(f" Debug Mode: True (Development)")
     print("="*50 + "\n")
 
+    preload_templates()
+
     """
     STARTUP MESSAGE:
     Shows important information when server starts.
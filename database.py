@@ -33,19 +33,44 @@ JUNIOR DEVELOPER NOTES:
 # IMPORTS - External Libraries We Need
 # ============================================================================
 
+import atexit
+import itertools
+import queue
+import re
 import sqlite3
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+import threading
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple
+
+from models import ExpenseCategory, parse_iso_date
 
 """
 IMPORT EXPLANATIONS:
+- atexit: Runs a function when Python exits (closes kept-open connections)
+- itertools: count() gives us an ever-increasing "data version" number
+- queue: Thread-safe LifoQueue for the connections kept between requests
+- re: The YYYY-MM-DD shape check in _check_expense
 - sqlite3: Python's built-in library for SQLite databases
-- datetime: Handles dates and times (for created_at timestamps)
+- threading: local() keeps one shared connection per thread (see below)
+- contextlib: contextmanager turns transaction() into a `with` block
+- functools: lru_cache/wraps for caching query results (see below)
 - typing: Helps us specify what type of data functions expect/return
   - List: A list of items (e.g., List[Dict] = list of dictionaries)
   - Dict: A dictionary/object (e.g., {"key": "value"})
   - Optional: Value can be the specified type OR None
   - Tuple: An immutable list (can't be changed after creation)
+  - Iterator: Something you loop over one item at a time (generators)
+  - Iterable: Anything a for loop accepts (list, tuple, generator, ...)
+- models.parse_iso_date: Fast, strict YYYY-MM-DD check (income validation)
+- models.ExpenseCategory: The valid expense categories (see _check_expense)
+
+DATABASE.PY DEPENDS ON MODELS.PY (ONE WAY ONLY):
+The date rules and the category list live in models.py, and we reuse
+them here instead of keeping a second copy that could drift. That's
+safe because models.py imports nothing from this project - keep it that
+way: if models.py ever imported database, the two files would need each
+other to load (a "circular import") and Python would fail at startup.
 """
 
 # ============================================================================
@@ -53,12 +78,19 @@ IMPORT EXPLANATIONS:
 # ============================================================================
 
 DATABASE_NAME = 'finance.db'
+SCHEMA_VERSION = 9
 
 """
 WHY USE CONSTANTS?
 If we ever need to rename the database file, we only change it here.
 All functions reference DATABASE_NAME, so they'll automatically use the new name.
 Convention: Constants are written in UPPERCASE_WITH_UNDERSCORES
+
+SCHEMA_VERSION:
+A number describing the current table layout. init_db() stores it inside the
+database file (PRAGMA user_version) and skips all setup work when the file is
+already at this version. Bump it whenever init_db() creates something new
+(a table, an index, ...) so existing databases get upgraded.
 """
 
 # ============================================================================
@@ -87,16 +119,379 @@ def get_db_connection():
         conn.close()
 
     BEST PRACTICE: Always close connections when done!
+
+    SHARED CONNECTIONS:
+    Between start_shared_connection() and end_shared_connection() (the web
+    app does this around every request), all calls in the same thread get
+    the SAME connection back, and conn.close() only rolls back anything
+    left uncommitted. When the request ends the connection isn't closed
+    either: it waits for the next request (see _idle_connections).
     """
-    conn = sqlite3.connect(DATABASE_NAME)
+    if getattr(_shared, 'active', False):
+        if _shared.conn is None:
+            _shared.conn = _checkout_shared_connection()
+        return _shared.conn
+
+    return _connect(sqlite3.Connection)
+
+
+def _connect(factory, **options) -> sqlite3.Connection:
+    """Opens DATABASE_NAME with our row factory and per-connection settings."""
+    conn = sqlite3.connect(DATABASE_NAME, factory=factory, **options)
     conn.row_factory = sqlite3.Row  # Return rows as dictionaries instead of tuples
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA mmap_size = 268435456')
+    conn.execute('PRAGMA cache_size = -20000')
     return conn
 
+    """
+    PRAGMA SETTINGS (apply to this connection only):
+    - synchronous = NORMAL: With WAL (see init_db) SQLite waits for the disk
+      less often; a power cut can lose the last commit, never corrupt the file
+    - temp_store = MEMORY: Temporary sorting space lives in RAM, not in files
+    - mmap_size = 256 MB: Read the file through memory mapping, which skips
+      a copy per page for large reads
+    - cache_size = -20000: Keep up to ~20 MB of pages in memory (negative
+      numbers mean KiB). Worth it now that connections stay open.
+    """
+
+
+class _SharedConnection(sqlite3.Connection):
+    """A long-lived connection, used by one request at a time (see get_db_connection)."""
+
+    def close(self):
+        # The connection stays open for the next request. Rolling back
+        # keeps a failed write from leaking into the next query.
+        self.rollback()
+
+
+_shared = threading.local()
+
+# Open connections waiting for the next request (at most this many are kept)
+_MAX_IDLE_CONNECTIONS = 4
+_idle_connections = queue.LifoQueue(maxsize=_MAX_IDLE_CONNECTIONS)
+
+
+def _checkout_shared_connection() -> _SharedConnection:
+    """Reuses an idle connection to DATABASE_NAME, or opens a new one."""
+    try:
+        conn = _idle_connections.get_nowait()
+    except queue.Empty:
+        conn = None  # None waiting - every kept connection is in use
+
+    if conn is not None and conn.database_name == DATABASE_NAME:
+        return conn
+    if conn is not None:
+        sqlite3.Connection.close(conn)  # DATABASE_NAME changed since it was opened
+
+    conn = _connect(_SharedConnection, check_same_thread=False)
+    conn.database_name = DATABASE_NAME
+    return conn
+
+
+def start_shared_connection() -> None:
+    """
+    Makes get_db_connection() reuse one connection in this thread.
+
+    Call end_shared_connection() when done (the web app uses Flask's
+    before_request / teardown_appcontext hooks). The connection itself
+    is taken (or opened) lazily, on the first query.
+    """
+    _shared.active = True
+    _shared.conn = None
+
+
+def end_shared_connection() -> None:
+    """Hands the connection used since start_shared_connection() back for reuse."""
+    conn = getattr(_shared, 'conn', None)
+    _shared.active = False
+    _shared.conn = None
+    if conn is None:
+        return
+
+    conn.rollback()
+    if conn.database_name == DATABASE_NAME:
+        try:
+            _idle_connections.put_nowait(conn)
+            return
+        except queue.Full:
+            pass  # Enough are waiting already
+    sqlite3.Connection.close(conn)
+
+
+def close_all_connections() -> None:
+    """Closes every idle connection (runs automatically when Python exits)."""
+    while True:
+        try:
+            sqlite3.Connection.close(_idle_connections.get_nowait())
+        except queue.Empty:
+            break
+
+
+# However the app is started (python app.py, flask run, a WSGI server) and
+# however it stops, the kept-open connections are closed cleanly at exit
+atexit.register(close_all_connections)
+
+"""
+WHY threading.local() AND NOT flask.g?
+database.py doesn't know about Flask - test scripts and the command line
+use it too. threading.local() gives every thread its own `_shared`, so
+two requests running at the same time never use the same connection.
+
+WHY KEEP CONNECTIONS OPEN?
+Opening finance.db means opening files, reading the schema and starting
+with an empty page cache. The Flask development server starts a new
+thread for every request, so a connection that belonged to the thread
+would be thrown away each time. Instead, finished requests put their
+connection in _idle_connections and the next request takes it from there.
+
+check_same_thread=False:
+sqlite3 normally refuses to use a connection in a different thread than
+the one that opened it. That is safe to switch off here because a
+connection is only ever used by ONE request at a time - it is either in
+_idle_connections or held by exactly one thread's `_shared`.
+queue.LifoQueue does its own locking, so two threads can't take the same
+connection, and it never holds more than _MAX_IDLE_CONNECTIONS.
+
+WHY LIFO (Last In, First Out)?
+The connection handed back most recently is handed out first. Its page
+cache is the warmest, and when traffic is low the same one or two
+connections do all the work.
+
+WHY NOT SEPARATE READ AND WRITE CONNECTIONS?
+With WAL (see init_db) readers never wait for the writer, and SQLite
+already lets only one connection write at a time - others wait up to
+five seconds (sqlite3's default timeout). A request both reads and
+writes, so it keeps ONE connection; a separate writer connection would
+only add a lock of our own on top of SQLite's.
+"""
+
+
+# ============================================================================
+# RESULT CACHING - Reuse Query Results Until the Data Changes
+# ============================================================================
+
+# One counter for the whole module; every write takes the next number and
+# stamps it on the tables it touched
+_write_counter = itertools.count(1)
+_data_version = {'expenses': 0, 'income': 0, 'budgets': 0}
+
+
+def _mark_changed(*tables: str) -> None:
+    """
+    Records that `tables` were modified, invalidating cached results.
+
+    Called by every function that writes, right after conn.commit().
+    """
+    version = next(_write_counter)
+    for table in tables:
+        _data_version[table] = version
+
+
+def get_data_version(*tables: str) -> Tuple[int, ...]:
+    """
+    Returns the change counters of `tables`, as stored in the database.
+
+    Triggers (created by init_db) add 1 to a table's counter on every
+    INSERT, UPDATE and DELETE - whether it comes from this process, another
+    worker process, `python database.py` or a SQLite browser. So "same
+    numbers as before" means "nothing changed", no matter who wrote.
+
+    Raises:
+        sqlite3.Error: If the counters can't be read
+
+    Example Usage:
+        get_data_version('expenses', 'income')  # (1760512345, 1760512309)
+    """
+    conn = get_db_connection()
+    try:
+        stored = dict(conn.execute('SELECT name, version FROM data_versions').fetchall())
+    finally:
+        conn.close()
+    return tuple(stored[table] for table in tables)
+
+
+def memoize_until_write(*tables: str, fallback: Callable[[], Any]):
+    """
+    Decorator: cache a read function's result until one of `tables` changes.
+
+    The cache key is (current version of each table, arguments). Any write to
+    one of those tables bumps its version, so the next call has a new key
+    and runs the query again; old entries simply age out of the LRU.
+
+    Each table has two versions: the counter stored in the database (see
+    get_data_version - catches writes from other processes) and the one in
+    this process (see _mark_changed - catches init_db() switching to a
+    different database file, whose stored counters could be the same).
+
+    Error handling moves into the decorator: the decorated function just
+    runs its query. If it raises sqlite3.Error we print the error and
+    return fallback() - and, importantly, do NOT cache that, so a temporary
+    failure (e.g. a locked database) isn't remembered.
+
+    Args:
+        *tables: Table names whose changes invalidate the result
+        fallback: Function returning the value to use when the query fails
+
+    Example Usage:
+        @memoize_until_write('expenses', fallback=dict)
+        def get_category_totals(): ...
+    """
+    def decorator(func):
+        @lru_cache(maxsize=32)
+        def cached(versions, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                versions = (get_data_version(*tables),
+                            tuple(_data_version[table] for table in tables))
+                return cached(versions, *args, **kwargs)
+            except sqlite3.Error as e:
+                print(f" Error in {func.__name__}: {e}")
+                return fallback()
+
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorator
+
+"""
+WHY CACHE?
+Pages like the dashboard ask for the same totals on every visit, but the
+numbers only change when someone adds, edits, or deletes something. So we
+keep the last answer and only ask SQLite again after a write.
+
+WHY STORE THE VERSIONS IN THE DATABASE?
+A counter kept only in Python would miss every write made by someone
+else: a second worker process (gunicorn -w 4), `python database.py`
+adding sample data, or an edit in a SQLite browser - and the cache would
+show old numbers until the next restart. The data_versions table lives
+in finance.db itself, and SQLite's triggers update it for every writer.
+
+The price is one tiny query (a single table lookup) per cached call,
+instead of the real query. Cheap next to the SUMs and GROUP BYs it saves.
+
+IMPORTANT LIMITATIONS:
+- Each cache is per process: every worker keeps its own copy, so a
+  result is computed once per worker.
+- Cached results are shared between callers: treat them as read-only.
+"""
+
 
 # ============================================================================
 # DATABASE INITIALIZATION
 # ============================================================================
 
+# Columns of the expenses table, with the rules every row must follow
+_EXPENSES_COLUMNS = '''
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL
+        CHECK (date GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'),
+    category TEXT NOT NULL CHECK (category <> ''),
+    amount REAL NOT NULL CHECK (amount > 0 AND amount < 10000000),
+    description TEXT CHECK (length(description) <= 500),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+'''
+
+"""
+CHECK CONSTRAINTS:
+A CHECK is a rule SQLite tests on every INSERT and UPDATE. If a row breaks
+it, the statement fails with sqlite3.IntegrityError and nothing is saved -
+no matter which function (or which program) tried to write it.
+
+The forms still run validate_expense_data() first, because it gives the
+user a friendly message. The CHECKs are the last line of defence.
+
+add_expense()/update_expense() do ONE cheap pre-flight check in Python
+(_check_expense, below) - only what the table can't check for us:
+1. The category must be one of ExpenseCategory - the table only checks
+   it isn't empty. A list of names in the schema would mean rebuilding
+   the table every time a category is added.
+2. The date must look like YYYY-MM-DD. The table checks that too, but an
+   old database whose rows break the rules keeps its table without the
+   CHECKs (see _add_expense_checks), and a garbage date would break every
+   date range and month total.
+Amount and description are left to the CHECKs (and the forms), so no
+rule is written down twice in this file.
+
+GLOB '[0-9]...':
+Like a filename wildcard: each [0-9] matches exactly one digit, so only
+text shaped like 2025-10-01 is accepted.
+"""
+
+
+# Same shape as the date GLOB in _EXPENSES_COLUMNS
+_DATE_SHAPE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+
+def _check_expense(date: str, category: str) -> None:
+    """
+    Raises ValueError for an unknown category or a date not shaped like
+    YYYY-MM-DD (see CHECK CONSTRAINTS for why only these two).
+
+    Two O(1) checks: one dict lookup and one precompiled regex match.
+    """
+    if ExpenseCategory.get_by_name(category) is None:
+        raise ValueError(f"Invalid category: {category!r}")
+
+    if not isinstance(date, str) or not _DATE_SHAPE.fullmatch(date):
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+
+
+def _add_expense_checks(cursor: sqlite3.Cursor) -> bool:
+    """
+    Rebuilds an expenses table created before the CHECK constraints existed.
+
+    SQLite can't add a CHECK to an existing table, so we create a new table
+    with the rules, copy the rows over, and swap the tables. If some old row
+    breaks a rule, nothing is changed and a warning is printed instead.
+
+    Args:
+        cursor: Cursor inside init_db()'s transaction
+
+    Returns:
+        bool: True if the table has the CHECK rules now, False if old rows
+        break them (init_db() then tries again on the next start)
+    """
+    table_sql = cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'expenses'"
+    ).fetchone()[0]
+    if 'CHECK' in table_sql:
+        return True  # Already has the rules
+
+    cursor.execute('DROP TABLE IF EXISTS expenses_checked')
+    cursor.execute(f'CREATE TABLE expenses_checked ({_EXPENSES_COLUMNS})')
+    try:
+        cursor.execute('''
+            INSERT INTO expenses_checked (id, date, category, amount, description, created_at)
+            SELECT id, date, category, amount, description, created_at FROM expenses
+        ''')
+    except sqlite3.IntegrityError as e:
+        print(f"Kept the expenses table without CHECK rules - existing rows break them: {e}")
+        print("Fix or delete those expenses; the upgrade runs again on the next start.")
+        cursor.execute('DROP TABLE expenses_checked')
+        return False
+
+    # Remember the highest ID ever handed out, so deleted IDs aren't reused
+    last_id = cursor.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'expenses'"
+    ).fetchone()
+
+    # Dropping the table also drops its indexes and triggers;
+    # init_db() creates them again right after this
+    cursor.execute('DROP TABLE expenses')
+    cursor.execute('ALTER TABLE expenses_checked RENAME TO expenses')
+
+    if last_id:
+        cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'expenses'")
+        cursor.execute(
+            "INSERT INTO sqlite_sequence (name, seq) VALUES ('expenses', ?)", (last_id[0],)
+        )
+    return True
+
+
 def init_db():
     """
     Initializes the database by creating all necessary tables.
@@ -125,27 +520,59 @@ def init_db():
     Raises:
         sqlite3.Error: If there's a problem creating the database
     """
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        # Fast path: the file already has the current schema, nothing to do
+        if cursor.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION:
+            conn.close()
+            return
+
+        """
+        SCHEMA VERSION CHECK:
+        PRAGMA user_version is a free integer SQLite keeps in the file header.
+        A brand-new (or pre-versioning) database reports 0, so it falls
+        through to the CREATE statements below, which are all safe to re-run.
+        """
+
+        # Write-ahead logging: readers no longer wait for a writer (and vice
+        # versa). Stored in the file itself, so setting it once is enough.
+        cursor.execute('PRAGMA journal_mode = WAL')
+
+        """
+        WAL (Write-Ahead Log):
+        By default SQLite locks the whole file while writing, so a page
+        view has to wait for a save in another request to finish. In WAL
+        mode new changes go to a separate finance.db-wal file first and
+        readers keep reading the last committed data in the meantime.
+        You'll see finance.db-wal and finance.db-shm next to finance.db -
+        they belong to the database, don't delete them while the app runs.
+        """
+
+        # Everything below is ONE transaction (journal_mode can't change inside one)
+        cursor.execute('BEGIN')
+
+        """
+        ONE TRANSACTION:
+        The upgrade drops and rebuilds tables. If anything fails half-way
+        (disk full, a bad trigger, ...), the rollback in the except block
+        below puts the database back exactly as it was, instead of leaving
+        a half-upgraded schema. That's also why the triggers below are
+        created with execute() and not executescript(): executescript()
+        COMMITs whatever is pending before it runs.
+        """
+
         """
         WHAT IS A CURSOR?
         A cursor is like a pointer that executes SQL commands and fetches results.
         Think of it as a pen that writes to/reads from the database.
         """
 
-        # Create expenses table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date TEXT NOT NULL,
-                category TEXT NOT NULL,
-                amount REAL NOT NULL,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        # Create expenses table (or add the CHECK rules to an older one)
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS expenses ({_EXPENSES_COLUMNS})')
+        expense_checks_added = _add_expense_checks(cursor)
 
         """
         EXPENSES TABLE STRUCTURE:
@@ -155,6 +582,7 @@ def init_db():
         - amount: How much money was spent (decimal number)
         - description: Optional notes about the expense
         - created_at: When this record was added to database (auto-generated)
+        The columns are defined in _EXPENSES_COLUMNS, above init_db().
         """
 
         # Create budgets table (we'll use this in Week 2)
@@ -204,7 +632,162 @@ def init_db():
         4. Future flexibility - income might need different fields later
         """
 
+        # Indexes for the filters on the expenses page
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_expenses_category_date ON expenses (category, date)')
+        # Replaced by idx_expenses_category_date (schema version 3 created it)
+        cursor.execute('DROP INDEX IF EXISTS idx_expenses_category')
+        # Newest-first income lists (ORDER BY date DESC, id DESC)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_income_date ON income (date)')
+        # Per-source income totals read only this index (see get_income_summary)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_income_source_amount ON income (source, amount)')
+
+        """
+        WHAT IS AN INDEX?
+        Like the index at the back of a book: a sorted list of dates (or
+        categories) pointing at the matching rows. WHERE date BETWEEN ...
+        or WHERE category = ... jump straight to the matching rows instead
+        of reading the whole table. The cost is a little extra work on each
+        INSERT/UPDATE to keep the index in order.
+
+        COMPOSITE INDEX (category, date):
+        Sorted by category first, then by date within each category - like
+        a phone book sorted by last name, then first name. One index serves
+        "all Shopping expenses, newest first" (filter AND sort), and still
+        works for category-only lookups, so a separate category index
+        would just be extra work on every write.
+
+        COVERING INDEX (source, amount):
+        SUM(amount) ... GROUP BY source needs nothing but those two
+        columns, and the index already has them, sorted by source. SQLite
+        walks the index from start to end, adding up one source after the
+        other, and never opens the income table itself. Expenses don't
+        need the same trick: their totals come from daily_totals below.
+        """
+
+        # Pre-aggregated spending per (day, category), kept up to date by triggers
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_totals (
+                date TEXT NOT NULL,
+                category TEXT NOT NULL,
+                total REAL NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (date, category)
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS expenses_daily_insert
+            AFTER INSERT ON expenses
+            BEGIN
+                INSERT INTO daily_totals (date, category, total, count)
+                VALUES (NEW.date, NEW.category, NEW.amount, 1)
+                ON CONFLICT (date, category) DO UPDATE
+                SET total = total + excluded.total, count = count + 1;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS expenses_daily_delete
+            AFTER DELETE ON expenses
+            BEGIN
+                UPDATE daily_totals
+                SET total = total - OLD.amount, count = count - 1
+                WHERE date = OLD.date AND category = OLD.category;
+                DELETE FROM daily_totals
+                WHERE date = OLD.date AND category = OLD.category AND count <= 0;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS expenses_daily_update
+            AFTER UPDATE OF date, category, amount ON expenses
+            BEGIN
+                UPDATE daily_totals
+                SET total = total - OLD.amount, count = count - 1
+                WHERE date = OLD.date AND category = OLD.category;
+                DELETE FROM daily_totals
+                WHERE date = OLD.date AND category = OLD.category AND count <= 0;
+                INSERT INTO daily_totals (date, category, total, count)
+                VALUES (NEW.date, NEW.category, NEW.amount, 1)
+                ON CONFLICT (date, category) DO UPDATE
+                SET total = total + excluded.total, count = count + 1;
+            END
+        ''')
+
+        # (Re)build the totals from the real rows - covers databases created
+        # before this table existed, and repairs any drift
+        cursor.execute('DELETE FROM daily_totals')
+        cursor.execute('''
+            INSERT INTO daily_totals (date, category, total, count)
+            SELECT date, category, SUM(amount), COUNT(*)
+            FROM expenses
+            GROUP BY date, category
+        ''')
+
+        """
+        DAILY_TOTALS TABLE (a "materialized view"):
+        One row per (date, category) holding the SUM and COUNT of matching
+        expenses. Totals for the dashboard, the category chart, or a month
+        are then computed from a few hundred small rows instead of reading
+        every single expense on every page view.
+
+        WHAT ARE TRIGGERS?
+        SQL that SQLite runs automatically after an INSERT/UPDATE/DELETE on
+        a table. Any change to `expenses` - from any function - updates the
+        matching daily_totals row in the same transaction, so the two can
+        never disagree. When the last expense of a day/category is removed
+        (count reaches 0) its row is deleted.
+
+        ON CONFLICT ... DO UPDATE ("upsert"):
+        Insert a new row, or if one already exists for that (date, category),
+        add to it instead.
+        """
+
+        # One change counter per table, bumped by triggers (see get_data_version)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS data_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        for table in _data_version:
+            # Start at the current time (in seconds), so a re-created
+            # finance.db doesn't repeat the old file's numbers
+            cursor.execute('''
+                INSERT OR IGNORE INTO data_versions (name, version)
+                VALUES (?, CAST(strftime('%s', 'now') AS INTEGER))
+            ''', (table,))
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE data_versions SET version = version + 1
+                        WHERE name = '{table}';
+                    END
+                ''')
+
+        """
+        DATA_VERSIONS TABLE:
+        One row per table ('expenses', 'income', 'budgets') with a number
+        that grows on every change, from any program that opens the file.
+        The caches (memoize_until_write) and the web pages' ETags compare
+        it with the number they saw last time.
+
+        The triggers run once per ROW, so a bulk import of 1,000 rows adds
+        1,000 to the counter - only "has it changed?" matters, not by how much.
+
+        f-string IN SQL?
+        Only safe because `table` and `event` are our own fixed names from
+        the loop above - never put user input into SQL this way.
+        """
+
+        # Record the schema version so the next call can skip all of this -
+        # unless the expenses upgrade failed, so it's tried again next time
+        if expense_checks_added:
+            cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION:d}')
+
         conn.commit()  # Save changes to database
+        _mark_changed('expenses', 'income', 'budgets')
         conn.close()   # Close connection
 
         print(f"Database initialized successfully: {DATABASE_NAME}")
@@ -217,6 +800,8 @@ def init_db():
         """
 
     except sqlite3.Error as e:
+        if conn is not None:
+            conn.rollback()  # Undo a half-finished upgrade (see ONE TRANSACTION)
         print(f"Database initialization error: {e}")
         raise  # Re-raise the error so calling code knows something went wrong
 
@@ -228,6 +813,57 @@ def init_db():
     """
 
 
+# ============================================================================
+# TRANSACTIONS - Several Writes, One Commit
+# ============================================================================
+
+@contextmanager
+def transaction(*tables: str) -> Iterator[sqlite3.Cursor]:
+    """
+    Runs several writes as ONE transaction: all of them are saved, or none.
+
+    Commits when the `with` block ends normally, rolls back if it raises.
+    Afterwards the cached results for `tables` are invalidated (all tables
+    if none are given).
+
+    Args:
+        *tables: Tables the block writes to, e.g. 'expenses', 'budgets'
+
+    Yields:
+        sqlite3.Cursor to run the statements with
+
+    Example Usage:
+        with transaction('expenses', 'budgets') as cursor:
+            cursor.execute('DELETE FROM expenses WHERE category = ?', ('Other',))
+            cursor.execute('DELETE FROM budgets WHERE category = ?', ('Other',))
+    """
+    conn = get_db_connection()
+    try:
+        yield conn.cursor()
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    _mark_changed(*(tables or _data_version))
+
+    """
+    @contextmanager:
+    Turns a generator into something usable with `with`. Code before
+    `yield` runs when the block starts, the yielded cursor becomes the
+    `as` variable, and the code after `yield` runs when the block ends.
+    If the block raises, the exception appears at the `yield` - that's
+    how we know to roll back instead of commit.
+
+    WHY BOTHER?
+    Every commit waits for the disk. Ten writes with one commit each wait
+    ten times; inside transaction() they wait once - and a failure
+    halfway through can't leave half of the changes saved.
+    """
+
+
 # ============================================================================
 # CREATE OPERATIONS (Adding New Data)
 # ============================================================================
@@ -255,8 +891,11 @@ def add_expense(date: str, category: str, amount: float, description: str = "")
         int: The ID of the newly created expense record
 
     Raises:
+        ValueError: If the category is unknown or the date isn't shaped
+            like YYYY-MM-DD (see _check_expense)
+        sqlite3.IntegrityError: If the data breaks a CHECK rule of the
+            expenses table (e.g. amount zero or negative)
         sqlite3.Error: If database operation fails
-        ValueError: If amount is negative or zero
 
     Example Usage:
         expense_id = add_expense('2025-10-01', 'Food & Dining', 25.50, 'Lunch at cafe')
@@ -270,18 +909,17 @@ def add_expense(date: str, category: str, amount: float, description: str = "")
     RIGHT (Safe): "INSERT INTO expenses VALUES (?, ?, ...)", (date, category, ...)
     """
 
-    # Validate input data
-    if amount <= 0:
-        raise ValueError("Amount must be positive")
-
     """
     INPUT VALIDATION:
     Always validate data BEFORE putting it in the database.
     This prevents bad data from corrupting your database.
+    _check_expense() does the cheap checks here; the CHECK rules in
+    _EXPENSES_COLUMNS reject anything else on INSERT.
     """
+    _check_expense(date, category)
 
+    conn = get_db_connection()
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
 
         # Insert new expense
@@ -305,7 +943,7 @@ def add_expense(date: str, category: str, amount: float, description: str = "")
         """
 
         conn.commit()
-        conn.close()
+        _mark_changed('expenses')  # Invalidate cached results (see memoize_until_write)
 
         return expense_id
 
@@ -313,13 +951,61 @@ def add_expense(date: str, category: str, amount: float, description: str = "")
         print(f"Error adding expense: {e}")
         raise
 
+    finally:
+        # Also runs when a CHECK rule rejects the row - an open connection
+        # would otherwise keep the database locked for other requests
+        conn.close()
+
+
+def add_expenses_bulk(rows: Iterable[Tuple[str, str, float, str]]) -> int:
+    """
+    Adds many expenses at once, in ONE transaction (see add_income_bulk).
+
+    All or nothing: the CHECK rules in _EXPENSES_COLUMNS check every row,
+    and if any row breaks them, nothing is saved.
+
+    Args:
+        rows: (date, category, amount, description) tuples
+
+    Returns:
+        int: Number of expenses added
+
+    Raises:
+        ValueError: If a row fails the pre-flight check (see _check_expense)
+        sqlite3.IntegrityError: If a row breaks a CHECK rule
+
+    Example Usage:
+        add_expenses_bulk([
+            ('2025-10-01', 'Food & Dining', 12.50, 'Lunch'),
+            ('2025-10-01', 'Transportation', 2.75, 'Bus'),
+        ])
+        # Returns: 2
+    """
+    rows = [tuple(row) for row in rows]
+    if not rows:
+        return 0
+    for row in rows:
+        _check_expense(row[0], row[1])
+
+    try:
+        with transaction('expenses') as cursor:
+            cursor.executemany('''
+                INSERT INTO expenses (date, category, amount, description)
+                VALUES (?, ?, ?, ?)
+            ''', rows)
+    except sqlite3.Error as e:
+        print(f"Error adding expenses: {e}")
+        raise
+
+    return len(rows)
+
 
 def set_budget(category: str, monthly_limit: float) -> bool:
     """
     Sets or updates a monthly budget limit for a specific category.
 
     UPSERT OPERATION:
-    This function checks if budget exists:
+    One SQL statement that does either:
     - If budget doesn't exist: create new budget
     - If budget exists: update only the monthly_limit (preserves created_at)
 
@@ -345,25 +1031,25 @@ def set_budget(category: str, monthly_limit: float) -> bool:
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Check if budget exists
-        cursor.execute('SELECT id FROM budgets WHERE category = ?', (category,))
-        existing = cursor.fetchone()
+        # One statement: insert, or update the limit if the category has a budget
+        cursor.execute('''
+            INSERT INTO budgets (category, monthly_limit)
+            VALUES (?, ?)
+            ON CONFLICT (category) DO UPDATE
+            SET monthly_limit = excluded.monthly_limit
+        ''', (category, monthly_limit))
 
-        if existing:
-            # Update existing budget (preserves created_at)
-            cursor.execute('''
-                UPDATE budgets
-                SET monthly_limit = ?
-                WHERE category = ?
-            ''', (monthly_limit, category))
-        else:
-            # Insert new budget
-            cursor.execute('''
-                INSERT INTO budgets (category, monthly_limit)
-                VALUES (?, ?)
-            ''', (category, monthly_limit))
+        """
+        ON CONFLICT ... DO UPDATE ("UPSERT"):
+        budgets.category is UNIQUE, so inserting a category that already
+        has a budget "conflicts". Instead of failing, SQLite then updates
+        that existing row - only monthly_limit, so created_at is kept.
+        `excluded` is the row we tried to insert.
+        Needs SQLite 3.24+, like the daily_totals triggers in init_db().
+        """
 
         conn.commit()
+        _mark_changed('budgets')  # Invalidate cached results (see memoize_until_write)
         conn.close()
 
         return True
@@ -377,19 +1063,25 @@ def set_budget(category: str, monthly_limit: float) -> bool:
 # READ OPERATIONS (Getting Data)
 # ============================================================================
 
-def get_all_expenses() -> List[Dict]:
+def get_all_expenses(limit: Optional[int] = None,
+                     after: Optional[Tuple[str, int]] = None) -> List[sqlite3.Row]:
     """
-    Retrieves all expenses from the database, sorted by date (newest first).
+    Retrieves expenses from the database, sorted by date (newest first).
+
+    With no arguments this is every expense. Pass `limit` to stop after
+    that many, and `after` (the (date, id) of the last expense you already
+    have) to get the ones that come next - see KEYSET PAGINATION below.
 
     RETURN TYPE EXPLAINED:
-    List[Dict] means this returns a list of dictionaries.
-    Example: [
+    List[sqlite3.Row] means this returns a list of database rows.
+    A Row is read like a dictionary (expense['amount']), so to the caller
+    it looks like: [
         {'id': 1, 'date': '2025-10-01', 'category': 'Food', 'amount': 25.50, ...},
         {'id': 2, 'date': '2025-09-30', 'category': 'Transport', 'amount': 15.00, ...}
     ]
 
     Returns:
-        List[Dict]: List of expense dictionaries, each containing:
+        List[sqlite3.Row]: List of expense rows, each containing:
             - id (int): Expense unique identifier
             - date (str): Expense date
             - category (str): Expense category
@@ -397,26 +1089,52 @@ def get_all_expenses() -> List[Dict]:
             - description (str): Expense description
             - created_at (str): Timestamp when record was created
 
+    Args:
+        limit: Maximum number of expenses to return (None = no limit)
+        after: (date, id) of the last expense already shown (None = start
+               from the newest)
+
     Example Usage:
         expenses = get_all_expenses()
         for expense in expenses:
             print(f"{expense['date']}: ${expense['amount']} on {expense['category']}")
+
+        # Page by page, 50 at a time
+        page = get_all_expenses(limit=50)
+        next_page = get_all_expenses(limit=50, after=(page[-1]['date'], page[-1]['id']))
     """
+    where, params = '', ()
+    if after is not None:
+        where, params = 'WHERE (date, id) < (?, ?)', tuple(after)
+
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute('''
+        # LIMIT -1 means "no limit" in SQLite, so one statement covers both
+        cursor.execute(f'''
             SELECT * FROM expenses
-            ORDER BY date DESC, created_at DESC
-        ''')
+            {where}
+            ORDER BY date DESC, id DESC
+            LIMIT ?
+        ''', params + (-1 if limit is None else limit,))
 
         """
         SQL SELECT EXPLAINED:
         - SELECT *: Get all columns from the table
         - FROM expenses: From the expenses table
         - ORDER BY date DESC: Sort by date, newest first (DESC = descending)
-        - created_at DESC: If same date, show most recently added first
+        - id DESC: If same date, show most recently added first
+          (ids only ever grow, so the newest row has the highest id)
+
+        KEYSET PAGINATION:
+        (date, id) < (?, ?) compares the pair like a dictionary compares
+        words: an earlier date, or the same date with a smaller id - i.e.
+        exactly the rows listed after the given one. idx_expenses_date
+        stores (date, id) in order (every index ends with the rowid), so
+        SQLite jumps straight to that spot and reads `limit` rows from
+        there. Unlike OFFSET (see get_expense_page) nothing is skipped
+        over, so page 1000 is as cheap as page 1.
         """
 
         expenses = cursor.fetchall()
@@ -430,20 +1148,23 @@ def get_all_expenses() -> List[Dict]:
 
         conn.close()
 
-        # Convert Row objects to dictionaries for easier use
-        return [dict(expense) for expense in expenses]
+        return expenses
 
         """
-        LIST COMPREHENSION:
-        [dict(expense) for expense in expenses]
-        This is shorthand for:
-
-        result = []
-        for expense in expenses:
-            result.append(dict(expense))
-        return result
-
-        It converts each Row object to a regular Python dictionary.
+        WHY NOT CONVERT TO DICTIONARIES?
+        We used to return [dict(expense) for expense in expenses], which
+        builds a second copy of every row. Now the list of sqlite3.Row
+        objects from fetchall() (the whole table, or one page of it) is
+        returned as it is. sqlite3.Row already supports everything callers
+        need:
+        - expense['amount']        (lookup by column name)
+        - expense.keys()           (the column names)
+        - {{ expense.amount }}     (Jinja templates fall back to ['amount'])
+
+        What a Row can NOT do is change or .get() - if you need that, make
+        a copy yourself with dict(expense). Rows being read-only is also why
+        it is safe for the cached readers (get_all_budgets) to hand the
+        same rows to every caller.
         """
 
     except sqlite3.Error as e:
@@ -451,19 +1172,103 @@ def get_all_expenses() -> List[Dict]:
         return []  # Return empty list on error
 
 
-def get_expense_by_id(expense_id: int) -> Optional[Dict]:
+def iter_all_expenses() -> Iterator[sqlite3.Row]:
+    """
+    Yields every expense one row at a time (same order as get_all_expenses).
+
+    GENERATORS:
+    A function with `yield` hands back one value, pauses, and continues
+    when the caller asks for the next one. Rows are read from SQLite as the
+    caller consumes them, so memory use stays flat no matter how many
+    expenses there are - ideal for exports.
+
+    Columns are always in this order, so each row can be written straight
+    to a CSV file: id, date, category, amount, description, created_at
+
+    Yields:
+        sqlite3.Row for each expense (access by name or by position)
+
+    Example Usage:
+        for row in iter_all_expenses():
+            print(row['date'], row['amount'])
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.execute('''
+            SELECT id, date, category, amount, description, created_at
+            FROM expenses
+            ORDER BY date DESC, id DESC
+        ''')
+        yield from cursor
+
+    except sqlite3.Error as e:
+        print(f" Error reading expenses: {e}")
+
+    finally:
+        if conn is not None:
+            conn.close()
+
+    """
+    FINALLY:
+    The connection stays open while the caller is still reading rows.
+    `finally` closes it when the loop finishes, when an error happens, or
+    when the caller stops early (e.g. a download is cancelled).
+    """
+
+
+def get_recent_expenses(limit: int = 5) -> List[sqlite3.Row]:
+    """
+    Retrieves only the newest `limit` expenses (same order as get_all_expenses).
+
+    WHY NOT get_all_expenses()[:5]?
+    Slicing in Python still reads and converts EVERY row first.
+    LIMIT tells SQLite to stop after `limit` rows.
+
+    WHY id DESC AND NOT created_at DESC?
+    Both put the newest row first, but an index on date also stores each
+    row's id, so "date DESC, id DESC" is exactly the index order: SQLite
+    walks idx_expenses_date backwards and stops after `limit` entries.
+    With created_at it would have to sort each day's rows first.
+
+    Args:
+        limit: Maximum number of expenses to return
+
+    Returns:
+        List of expense dictionaries, newest first
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT * FROM expenses
+            ORDER BY date DESC, id DESC
+            LIMIT ?
+        ''', (limit,))
+        expenses = cursor.fetchall()
+        conn.close()
+
+        return expenses
+
+    except sqlite3.Error as e:
+        print(f" Error getting recent expenses: {e}")
+        return []
+
+
+def get_expense_by_id(expense_id: int) -> Optional[sqlite3.Row]:
     """
     Retrieves a single expense by its ID.
 
     OPTIONAL TYPE:
-    Optional[Dict] means this function returns either a Dictionary OR None.
+    Optional[sqlite3.Row] means this function returns either a Row OR None.
     We return None if no expense with that ID exists.
 
     Args:
         expense_id: The unique ID of the expense to retrieve
 
     Returns:
-        Optional[Dict]: Expense dictionary if found, None if not found
+        Optional[sqlite3.Row]: Expense row if found, None if not found
 
     Example Usage:
         expense = get_expense_by_id(5)
@@ -492,24 +1297,15 @@ def get_expense_by_id(expense_id: int) -> Optional[Dict]:
         expense = cursor.fetchone()
         conn.close()
 
-        return dict(expense) if expense else None
-
-        """
-        TERNARY OPERATOR:
-        "X if condition else Y" is shorthand for:
-
-        if expense:
-            return dict(expense)
-        else:
-            return None
-        """
+        # fetchone() already gives None when nothing matched
+        return expense
 
     except sqlite3.Error as e:
         print(f" Error getting expense by ID: {e}")
         return None
 
 
-def get_expenses_by_category(category: str) -> List[Dict]:
+def get_expenses_by_category(category: str) -> List[sqlite3.Row]:
     """
     Retrieves all expenses for a specific category.
 
@@ -517,12 +1313,18 @@ def get_expenses_by_category(category: str) -> List[Dict]:
         category: The category to filter by
 
     Returns:
-        List[Dict]: List of expenses in the specified category
+        List[sqlite3.Row]: List of expenses in the specified category
 
     Example Usage:
         food_expenses = get_expenses_by_category('Food & Dining')
-        total = sum(exp['amount'] for exp in food_expenses)
-        print(f"Total food spending: ${total:.2f}")
+        for expense in food_expenses:
+            print(f"{expense['date']}: ${expense['amount']:.2f}")
+
+    NEED ONLY THE TOTAL?
+    Don't add up these rows in Python - ask SQL for it instead:
+        count, total = get_expense_totals('Food & Dining')
+    That sums a few pre-added daily_totals rows and returns two numbers,
+    instead of building one Row per expense just to read its amount.
     """
     try:
         conn = get_db_connection()
@@ -531,20 +1333,20 @@ def get_expenses_by_category(category: str) -> List[Dict]:
         cursor.execute('''
             SELECT * FROM expenses
             WHERE category = ?
-            ORDER BY date DESC
+            ORDER BY date DESC, id DESC
         ''', (category,))
 
         expenses = cursor.fetchall()
         conn.close()
 
-        return [dict(expense) for expense in expenses]
+        return expenses
 
     except sqlite3.Error as e:
         print(f" Error getting expenses by category: {e}")
         return []
 
 
-def get_expenses_by_date_range(start_date: str, end_date: str) -> List[Dict]:
+def get_expenses_by_date_range(start_date: str, end_date: str) -> List[sqlite3.Row]:
     """
     Retrieves expenses within a specified date range (inclusive).
 
@@ -552,17 +1354,37 @@ def get_expenses_by_date_range(start_date: str, end_date: str) -> List[Dict]:
     BETWEEN operator includes both start_date and end_date.
     Dates should be in 'YYYY-MM-DD' format for proper comparison.
 
+    WHY AN INCLUSIVE END IS SAFE HERE:
+    The date column only ever holds the day itself (the CHECK in
+    _EXPENSES_COLUMNS), so "<= '2025-10-31'" can't miss an expense from
+    late on the 31st. If a time of day is ever stored in this column,
+    switch to a half-open range - date >= start AND date < the day after
+    end - rather than wrapping the column in DATE(date), which would stop
+    SQLite from using idx_expenses_date.
+
     Args:
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
 
     Returns:
-        List[Dict]: List of expenses within the date range
+        List[sqlite3.Row]: List of expenses within the date range
 
     Example Usage:
         # Get all expenses in October 2025
         oct_expenses = get_expenses_by_date_range('2025-10-01', '2025-10-31')
     """
+    # A missing or backwards range can't match anything - no query needed
+    if not start_date or not end_date or start_date > end_date:
+        return []
+
+    """
+    COMPARING DATE STRINGS:
+    YYYY-MM-DD strings sort exactly like the dates they stand for, so a
+    plain string comparison tells us the range is backwards. SQLite would
+    give the same empty answer, but only after preparing and running the
+    query.
+    """
+
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -570,77 +1392,294 @@ def get_expenses_by_date_range(start_date: str, end_date: str) -> List[Dict]:
         cursor.execute('''
             SELECT * FROM expenses
             WHERE date BETWEEN ? AND ?
-            ORDER BY date DESC
+            ORDER BY date DESC, id DESC
         ''', (start_date, end_date))
 
-        expenses = cursor.fetchall()
-        conn.close()
+        expenses = cursor.fetchall()
+        conn.close()
+
+        return expenses
+
+    except sqlite3.Error as e:
+        print(f" Error getting expenses by date range: {e}")
+        return []
+
+
+def _expense_filter(category: str = '', start_date: str = '',
+                    end_date: str = '') -> Tuple[str, Tuple[str, ...]]:
+    """
+    Builds the WHERE clause for the expenses page filters.
+
+    Only fixed SQL text is combined here - the values themselves are still
+    passed as ? parameters, so this is safe from SQL injection. Works for
+    both `expenses` and `daily_totals`, which share the date and category
+    columns.
+
+    Returns:
+        Tuple of (where_clause, params), e.g.
+        ('WHERE category = ?', ('Shopping',)) - or ('', ()) for no filter
+    """
+    conditions, params = [], []
+    if category:
+        conditions.append('category = ?')
+        params.append(category)
+    if start_date and end_date:
+        conditions.append('date BETWEEN ? AND ?')
+        params += [start_date, end_date]
+
+    if not conditions:
+        return '', ()
+    return 'WHERE ' + ' AND '.join(conditions), tuple(params)
+
+
+def get_expense_page(limit: int, offset: int = 0, category: str = '',
+                     start_date: str = '', end_date: str = '') -> List[sqlite3.Row]:
+    """
+    Retrieves one page of expenses (newest first), optionally filtered.
+
+    Args:
+        limit: Maximum number of expenses to return (the page size)
+        offset: How many (newer) expenses to skip - (page - 1) * limit
+        category: Only this category (optional)
+        start_date, end_date: Only this date range, inclusive (optional)
+
+    Returns:
+        List[sqlite3.Row]: At most `limit` expenses
+
+    Example Usage:
+        # Second page of 50 Shopping expenses
+        page = get_expense_page(50, offset=50, category='Shopping')
+    """
+    where, params = _expense_filter(category, start_date, end_date)
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+            SELECT * FROM expenses
+            {where}
+            ORDER BY date DESC, id DESC
+            LIMIT ? OFFSET ?
+        ''', params + (limit, offset))
+
+        expenses = cursor.fetchall()
+        conn.close()
+
+        return expenses
+
+    except sqlite3.Error as e:
+        print(f" Error getting expenses page: {e}")
+        return []
+
+    """
+    LIMIT / OFFSET:
+    LIMIT 50 stops after 50 rows; OFFSET 100 first skips 100 of them. With
+    ORDER BY date DESC, id DESC that is exactly "page 3", and SQLite walks
+    the date (or category, date) index in order, so it never sorts - or
+    even reads - the rows after the page. Skipped rows are still stepped
+    over, which only matters with many thousands of pages; then you'd
+    continue from the last row shown instead ("keyset pagination":
+    WHERE (date, id) < (?, ?)).
+    """
+
+
+@memoize_until_write('expenses', fallback=lambda: (0, 0.0))
+def get_expense_totals(category: str = '', start_date: str = '',
+                       end_date: str = '') -> Tuple[int, float]:
+    """
+    Counts and adds up the expenses matching the expenses page filters.
+
+    The page only shows 50 rows at a time, but its statistics describe
+    every matching expense - so they come from SQL instead of the rows.
+
+    Args:
+        category, start_date, end_date: Same filters as get_expense_page()
+
+    Returns:
+        Tuple of (count, total_amount)
+
+    Example Usage:
+        count, total = get_expense_totals('Shopping')
+        count, total = get_expense_totals('', '2025-10-01', '2025-10-31')
+
+
+    CACHED:
+    Reused until the next expense write (see memoize_until_write).
+    """
+    where, params = _expense_filter(category, start_date, end_date)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    # daily_totals has the same date/category columns, with one
+    # pre-added row per day and category (see init_db)
+    cursor.execute(f'''
+        SELECT COALESCE(SUM(count), 0) as count, COALESCE(SUM(total), 0.0) as total
+        FROM daily_totals
+        {where}
+    ''', params)
+    row = cursor.fetchone()
+    conn.close()
+
+    return row['count'], row['total']
+
+
+@memoize_until_write('expenses', fallback=dict)
+def get_category_totals(start_date: str = '', end_date: str = '') -> Dict[str, float]:
+    """
+    Calculates total spending for each category (optionally for a date range).
+
+    SQL AGGREGATION:
+    GROUP BY groups rows with the same category together.
+    SUM(amount) adds up all amounts in each group.
+    This is very efficient - database does the math instead of Python!
+
+    Args:
+        start_date, end_date: Only count this date range, inclusive
+                              (optional - both or neither, like
+                              get_expense_page)
+
+    Returns:
+        Dict[str, float]: Dictionary mapping category names to total amounts
+        Example: {'Food & Dining': 250.50, 'Transportation': 85.00}
+
+    Example Usage:
+        totals = get_category_totals()
+        for category, amount in totals.items():
+            print(f"{category}: ${amount:.2f}")
+
+        october = get_category_totals('2025-10-01', '2025-10-31')
+
+
+    CACHED:
+    The result is reused until the next expense write (see
+    memoize_until_write). Errors return {} and are not cached.
+    """
+    where, params = _expense_filter('', start_date, end_date)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f'''
+        SELECT category, SUM(total) as total
+        FROM daily_totals
+        {where}
+        GROUP BY category
+        ORDER BY total DESC
+    ''', params)
+
+    """
+    WHY daily_totals AND NOT expenses?
+    daily_totals already holds one pre-added row per day and category
+    (see init_db), so SQLite sums a handful of rows per category
+    instead of every expense ever recorded.
+    """
+
+    """
+    SQL AGGREGATE FUNCTIONS:
+    - SUM(column): Adds up all values
+    - COUNT(column): Counts number of rows
+    - AVG(column): Calculates average
+    - MAX(column): Finds maximum value
+    - MIN(column): Finds minimum value
+
+    AS keyword creates an alias (nickname) for the result column
+    """
+
+    results = cursor.fetchall()
+    conn.close()
+
+    # Convert list of rows to dictionary
+    return {row['category']: row['total'] for row in results}
+
+    """
+    DICTIONARY COMPREHENSION:
+    {key: value for item in list}
+    This creates a dictionary from the query results.
+    """
+
+
+@memoize_until_write('expenses', fallback=lambda: (0, 0.0, {}))
+def get_expense_summary() -> Tuple[int, float, Dict[str, float]]:
+    """
+    Returns expense count, total and per-category totals in one query.
+
+    Reads the pre-aggregated daily_totals table, so the cost depends on the
+    number of (day, category) pairs, not the number of expenses.
+
+    Returns:
+        Tuple of (count, total_amount, {category: total})
+        Example: (42, 1234.5, {'Food & Dining': 300.0, 'Shopping': 934.5})
+
+    Example Usage:
+        count, total, by_category = get_expense_summary()
+
+
+    CACHED:
+    Reused until the next expense write (see memoize_until_write).
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
 
-        return [dict(expense) for expense in expenses]
+    cursor.execute('''
+        SELECT category, SUM(total) as total, SUM(count) as count
+        FROM daily_totals
+        GROUP BY category
+        ORDER BY total DESC
+    ''')
+    rows = cursor.fetchall()
+    conn.close()
 
-    except sqlite3.Error as e:
-        print(f" Error getting expenses by date range: {e}")
-        return []
+    by_category = {row['category']: row['total'] for row in rows}
+    count = sum(row['count'] for row in rows)
+    return count, sum(by_category.values()), by_category
 
 
-def get_category_totals() -> Dict[str, float]:
+@memoize_until_write('expenses', fallback=dict)
+def get_monthly_totals(start_date: str, end_date: str) -> Dict[str, float]:
     """
-    Calculates total spending for each category.
+    Calculates total spending per month within a date range (inclusive).
 
-    SQL AGGREGATION:
-    GROUP BY groups rows with the same category together.
-    SUM(amount) adds up all amounts in each group.
-    This is very efficient - database does the math instead of Python!
+    Args:
+        start_date: First day to include (YYYY-MM-DD)
+        end_date: Last day to include (YYYY-MM-DD)
 
     Returns:
-        Dict[str, float]: Dictionary mapping category names to total amounts
-        Example: {'Food & Dining': 250.50, 'Transportation': 85.00}
+        Dict[str, float]: Month strings (YYYY-MM) mapped to totals, oldest first.
+        Months without spending are left out.
+        Example: {'2025-09': 525.0, '2025-10': 480.0}
 
     Example Usage:
-        totals = get_category_totals()
-        for category, amount in totals.items():
-            print(f"{category}: ${amount:.2f}")
-    """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        trend = get_monthly_totals('2025-04-16', '2025-10-15')
 
-        cursor.execute('''
-            SELECT category, SUM(amount) as total
-            FROM expenses
-            GROUP BY category
-            ORDER BY total DESC
-        ''')
 
-        """
-        SQL AGGREGATE FUNCTIONS:
-        - SUM(column): Adds up all values
-        - COUNT(column): Counts number of rows
-        - AVG(column): Calculates average
-        - MAX(column): Finds maximum value
-        - MIN(column): Finds minimum value
-
-        AS keyword creates an alias (nickname) for the result column
-        """
+    CACHED:
+    Reused until the next expense write (see memoize_until_write).
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
 
-        results = cursor.fetchall()
-        conn.close()
+    cursor.execute('''
+        SELECT substr(date, 1, 7) as month, SUM(total) as total
+        FROM daily_totals
+        WHERE date BETWEEN ? AND ?
+        GROUP BY month
+        ORDER BY month
+    ''', (start_date, end_date))
 
-        # Convert list of rows to dictionary
-        return {row['category']: row['total'] for row in results}
+    """
+    substr(date, 1, 7):
+    Dates are stored as 'YYYY-MM-DD' text, so the first 7 characters are
+    the month ('2025-10'). Grouping by that adds up each month's days.
+    The primary key of daily_totals starts with date, so the BETWEEN
+    filter only reads the days inside the range.
+    """
 
-        """
-        DICTIONARY COMPREHENSION:
-        {key: value for item in list}
-        This creates a dictionary from the query results.
-        """
+    rows = cursor.fetchall()
+    conn.close()
 
-    except sqlite3.Error as e:
-        print(f" Error getting category totals: {e}")
-        return {}
+    return {row['month']: row['total'] for row in rows}
 
 
-def get_budget(category: str) -> Optional[Dict]:
+def get_budget(category: str) -> Optional[sqlite3.Row]:
     """
     Retrieves budget information for a specific category.
 
@@ -648,12 +1687,17 @@ def get_budget(category: str) -> Optional[Dict]:
         category: Category name to get budget for
 
     Returns:
-        Optional[Dict]: Budget dictionary if exists, None otherwise
+        Optional[sqlite3.Row]: Budget row if exists, None otherwise
 
     Example Usage:
         budget = get_budget('Food & Dining')
         if budget:
             print(f"Monthly limit: ${budget['monthly_limit']}")
+
+    NOT CACHED:
+    One lookup by the UNIQUE category index costs about as much as the
+    version check memoize_until_write would run first, so a cache would
+    save nothing (same as get_expense_by_id).
     """
     try:
         conn = get_db_connection()
@@ -667,34 +1711,115 @@ def get_budget(category: str) -> Optional[Dict]:
         budget = cursor.fetchone()
         conn.close()
 
-        return dict(budget) if budget else None
+        return budget
 
     except sqlite3.Error as e:
         print(f" Error getting budget: {e}")
         return None
 
 
-def get_all_budgets() -> List[Dict]:
+@memoize_until_write('budgets', fallback=list)
+def get_all_budgets() -> List[sqlite3.Row]:
     """
     Retrieves all budget records.
 
     Returns:
-        List[Dict]: List of all budget dictionaries
+        List[sqlite3.Row]: List of all budget rows
+
+
+    CACHED:
+    Reused until the next budget write (see memoize_until_write).
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    conn = get_db_connection()
+    cursor = conn.cursor()
 
-        cursor.execute('SELECT * FROM budgets ORDER BY category')
+    cursor.execute('SELECT * FROM budgets ORDER BY category')
 
-        budgets = cursor.fetchall()
-        conn.close()
+    budgets = cursor.fetchall()
+    conn.close()
 
-        return [dict(budget) for budget in budgets]
+    return budgets
 
-    except sqlite3.Error as e:
-        print(f" Error getting budgets: {e}")
-        return []
+
+@memoize_until_write('expenses', 'budgets', fallback=dict)
+def get_budget_status(year: int, month: int) -> Dict[str, Dict]:
+    """
+    Compares each budget with the spending in its category for one month.
+
+    Args:
+        year: Year to check (e.g., 2025)
+        month: Month to check (1-12)
+
+    Returns:
+        Dict[str, Dict]: Category mapped to its status, ordered by category:
+        {
+            'Food & Dining': {
+                'limit': 500.0,
+                'spent': 350.0,
+                'remaining': 150.0,
+                'percentage': 70.0,
+                'over_budget': False
+            },
+            ...
+        }
+
+    Example Usage:
+        for category, status in get_budget_status(2025, 10).items():
+            print(f"{category}: {status['percentage']:.1f}% used")
+
+
+    CACHED:
+    Reused until the next expense or budget write (see
+    memoize_until_write). Treat the result as read-only.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    month_key = f"{year:04d}-{month:02d}"
+    cursor.execute('''
+        WITH month_spending AS (
+            SELECT category, SUM(total) as spent
+            FROM daily_totals
+            WHERE date BETWEEN ? AND ?
+            GROUP BY category
+        )
+        SELECT b.category, b.monthly_limit, COALESCE(m.spent, 0.0) as spent
+        FROM budgets b
+        LEFT JOIN month_spending m ON m.category = b.category
+        ORDER BY b.category
+    ''', (f"{month_key}-01", f"{month_key}-31"))
+
+    """
+    WITH ... AS (a "CTE", Common Table Expression):
+    Gives a name to a sub-query so the main query can use it like a table.
+    month_spending = this month's total per category.
+
+    LEFT JOIN + COALESCE:
+    Every budget appears, even with no spending this month yet - the
+    LEFT JOIN leaves `spent` empty (NULL) and COALESCE turns that into 0.
+
+    WHY BETWEEN '...-01' AND '...-31' AND NOT strftime('%Y-%m', date) = ?
+    Comparing the raw date column lets SQLite use the index on date;
+    wrapping the column in a function would force it to check every row.
+    """
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    status = {}
+    for row in rows:
+        limit = row['monthly_limit']
+        spent = row['spent']
+        percentage = (spent / limit * 100) if limit > 0 else 0
+        status[row['category']] = {
+            'limit': limit,
+            'spent': spent,
+            'remaining': limit - spent,
+            'percentage': round(percentage, 1),
+            'over_budget': spent > limit
+        }
+
+    return status
 
 
 # ============================================================================
@@ -718,7 +1843,11 @@ def update_expense(expense_id: int, date: str, category: str,
         description: New description value
 
     Returns:
-        bool: True if update succeeded, False otherwise
+        bool: True if update succeeded, False otherwise (including new
+        values that break a CHECK rule of the expenses table)
+
+    Raises:
+        ValueError: If the new values fail the pre-flight check (see _check_expense)
 
     Example Usage:
         success = update_expense(5, '2025-10-01', 'Food & Dining', 30.00, 'Dinner')
@@ -727,12 +1856,10 @@ def update_expense(expense_id: int, date: str, category: str,
         else:
             print("Update failed - expense may not exist")
     """
+    _check_expense(date, category)
 
-    if amount <= 0:
-        raise ValueError("Amount must be positive")
-
+    conn = get_db_connection()
     try:
-        conn = get_db_connection()
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -762,7 +1889,8 @@ def update_expense(expense_id: int, date: str, category: str,
         """
 
         conn.commit()
-        conn.close()
+        if rows_affected:
+            _mark_changed('expenses')  # Invalidate cached results (see delete_expense)
 
         return rows_affected > 0
 
@@ -770,6 +1898,9 @@ def update_expense(expense_id: int, date: str, category: str,
         print(f" Error updating expense: {e}")
         return False
 
+    finally:
+        conn.close()
+
 
 # ============================================================================
 # DELETE OPERATIONS (Removing Data)
@@ -817,10 +1948,20 @@ def delete_expense(expense_id: int) -> bool:
         rows_affected = cursor.rowcount
 
         conn.commit()
+        if rows_affected:
+            # Invalidate cached results (see memoize_until_write) - but only
+            # if something was really deleted; a missing id changes nothing
+            _mark_changed('expenses')
         conn.close()
 
         return rows_affected > 0
 
+        """
+        ONE QUERY:
+        rowcount tells us whether a row was deleted, so there's no need to
+        SELECT the expense first to find out if it exists.
+        """
+
     except sqlite3.Error as e:
         print(f" Error deleting expense: {e}")
         return False
@@ -848,6 +1989,8 @@ def delete_budget(category: str) -> bool:
         rows_affected = cursor.rowcount
 
         conn.commit()
+        if rows_affected:
+            _mark_changed('budgets')  # Invalidate cached results (see delete_expense)
         conn.close()
 
         return rows_affected > 0
@@ -861,6 +2004,12 @@ def delete_budget(category: str) -> bool:
 # UTILITY FUNCTIONS
 # ============================================================================
 
+@memoize_until_write('expenses', 'budgets', fallback=lambda: {
+    'total_expenses': 0,
+    'total_budgets': 0,
+    'earliest_date': None,
+    'latest_date': None
+})
 def get_database_stats() -> Dict[str, int]:
     """
     Returns statistics about the database contents.
@@ -879,40 +2028,37 @@ def get_database_stats() -> Dict[str, int]:
     Example Usage:
         stats = get_database_stats()
         print(f"Database contains {stats['total_expenses']} expenses")
-    """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
 
-        # Count expenses
-        cursor.execute('SELECT COUNT(*) as count FROM expenses')
-        expense_count = cursor.fetchone()['count']
 
-        # Count budgets
-        cursor.execute('SELECT COUNT(*) as count FROM budgets')
-        budget_count = cursor.fetchone()['count']
+    CACHED:
+    Reused until the next expense or budget write (see
+    memoize_until_write). Errors return zeros and are not cached.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
 
-        # Get date range
-        cursor.execute('SELECT MIN(date) as earliest, MAX(date) as latest FROM expenses')
-        date_range = cursor.fetchone()
+    # Every number in one statement: each (SELECT ...) is a subquery
+    cursor.execute('''
+        SELECT
+            (SELECT COUNT(*) FROM expenses) as total_expenses,
+            (SELECT COUNT(*) FROM budgets) as total_budgets,
+            (SELECT MIN(date) FROM expenses) as earliest_date,
+            (SELECT MAX(date) FROM expenses) as latest_date
+    ''')
+    stats = dict(cursor.fetchone())
 
-        conn.close()
+    conn.close()
 
-        return {
-            'total_expenses': expense_count,
-            'total_budgets': budget_count,
-            'earliest_date': date_range['earliest'],
-            'latest_date': date_range['latest']
-        }
+    return stats
 
-    except sqlite3.Error as e:
-        print(f" Error getting database stats: {e}")
-        return {
-            'total_expenses': 0,
-            'total_budgets': 0,
-            'earliest_date': None,
-            'latest_date': None
-        }
+    """
+    SCALAR SUBQUERIES:
+    A subquery in parentheses that returns one value can be used like a
+    column. The outer SELECT has no FROM, so it produces exactly one row
+    with all four numbers - one execute/fetch instead of three.
+    MIN(date) and MAX(date) are answered from the date index: SQLite just
+    looks at its first and last entry.
+    """
 
 
 # ============================================================================
@@ -948,8 +2094,33 @@ def add_income(date: str, source: str, amount: float, description: str = '') ->
     - Income amount should always be positive
     - Common sources: Salary, Freelance, Business, Investment, Gift, Refund
     """
-    # Validate input data
+    _validate_income(date, source, amount, description)
+
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO income (date, source, amount, description)
+            VALUES (?, ?, ?, ?)
+        ''', (date, source, amount, description))
+
+        conn.commit()
+        _mark_changed('income')  # Invalidate cached results (see memoize_until_write)
+        income_id = cursor.lastrowid  # Get the ID of the record we just inserted
+        conn.close()
+
+        return income_id
+
+    except sqlite3.Error as e:
+        print(f"Error adding income: {e}")
+        raise
+
+
+def _validate_income(date: str, source: str, amount: float, description: str) -> None:
     """
+    Raises ValueError if an income record can't be stored (see add_income).
+
     INPUT VALIDATION EXPLAINED:
     We validate BEFORE touching the database to prevent bad data.
     This is called "defensive programming" - assume all input is malicious.
@@ -973,39 +2144,70 @@ def add_income(date: str, source: str, amount: float, description: str = '') ->
 
     # Validate date format
     try:
-        datetime.strptime(date, '%Y-%m-%d')
-        # strptime: "string parse time" - converts string to datetime
-        # If format wrong, raises ValueError
+        parse_iso_date(date)
+        # Precompiled YYYY-MM-DD pattern + fromisoformat (see models.py) -
+        # much cheaper than strptime, and also rejects '2025-02-30'
     except ValueError:
         raise ValueError("Invalid date format. Use YYYY-MM-DD")
         # Re-raise with clearer message for user
 
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
 
-        cursor.execute('''
-            INSERT INTO income (date, source, amount, description)
-            VALUES (?, ?, ?, ?)
-        ''', (date, source, amount, description))
+def add_income_bulk(rows: Iterable[Tuple[str, str, float, str]]) -> int:
+    """
+    Adds many income records at once, in ONE transaction.
 
-        conn.commit()
-        income_id = cursor.lastrowid  # Get the ID of the record we just inserted
-        conn.close()
+    All or nothing: if any row is invalid, nothing is saved.
 
-        return income_id
+    Args:
+        rows: (date, source, amount, description) tuples, e.g. from a CSV import
+
+    Returns:
+        int: Number of records added
+
+    Raises:
+        ValueError: If validation fails for any row
+
+    Example:
+        add_income_bulk([
+            ('2025-09-01', 'Salary', 5000.00, 'September paycheck'),
+            ('2025-10-01', 'Salary', 5000.00, 'October paycheck'),
+        ])
+        # Returns: 2
+    """
+    rows = [tuple(row) for row in rows]
+    for date, source, amount, description in rows:
+        _validate_income(date, source, amount, description)
+    if not rows:
+        return 0
 
+    try:
+        with transaction('income') as cursor:
+            cursor.executemany('''
+                INSERT INTO income (date, source, amount, description)
+                VALUES (?, ?, ?, ?)
+            ''', rows)
     except sqlite3.Error as e:
         print(f"Error adding income: {e}")
         raise
 
+    return len(rows)
+
+    """
+    WHY NOT CALL add_income() IN A LOOP?
+    Every commit() waits until the data is really on disk. add_income()
+    commits once per record, so importing 1,000 records means 1,000 waits.
+    Here everything runs inside one transaction() and executemany() runs
+    the same prepared INSERT for every row, so there is a single commit
+    (and a single wait) at the end.
+    """
+
 
-def get_all_income() -> List[Dict]:
+def get_all_income() -> List[sqlite3.Row]:
     """
     Retrieves all income records from the database.
 
     Returns:
-        List of dictionaries, each containing an income record
+        List of rows, each containing an income record
         Sorted by date (newest first)
 
     Example Return Value:
@@ -1022,15 +2224,203 @@ def get_all_income() -> List[Dict]:
         income_records = cursor.fetchall()
         conn.close()
 
-        # Convert Row objects to dictionaries
-        return [dict(record) for record in income_records]
+        # Rows are read like dictionaries (see get_all_expenses)
+        return income_records
 
     except sqlite3.Error as e:
         print(f"Error fetching income: {e}")
         return []
 
 
-def get_income_by_id(income_id: int) -> Optional[Dict]:
+def get_income_page(limit: int, offset: int = 0) -> List[sqlite3.Row]:
+    """
+    Retrieves one page of income records (same order as get_all_income).
+
+    Args:
+        limit: Maximum number of records to return (the page size)
+        offset: How many (newer) records to skip - (page - 1) * limit
+
+    Returns:
+        List of rows, at most `limit` records
+
+    Example Usage:
+        first_page = get_income_page(50)
+        second_page = get_income_page(50, offset=50)
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        # LIMIT/OFFSET explained in get_expense_page
+        cursor.execute('''
+            SELECT * FROM income
+            ORDER BY date DESC, id DESC
+            LIMIT ? OFFSET ?
+        ''', (limit, offset))
+        income_records = cursor.fetchall()
+        conn.close()
+
+        return income_records
+
+    except sqlite3.Error as e:
+        print(f"Error fetching income page: {e}")
+        return []
+
+
+def get_recent_income(limit: int = 5) -> List[sqlite3.Row]:
+    """
+    Retrieves only the newest `limit` income records (same order as get_all_income).
+
+    Args:
+        limit: Maximum number of records to return
+
+    Returns:
+        List of income rows, newest first
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT * FROM income ORDER BY date DESC, id DESC LIMIT ?', (limit,))
+        income_records = cursor.fetchall()
+        conn.close()
+
+        return income_records
+
+    except sqlite3.Error as e:
+        print(f"Error fetching recent income: {e}")
+        return []
+
+
+@memoize_until_write('income', fallback=lambda: (0, 0.0, {}))
+def get_income_summary() -> Tuple[int, float, Dict[str, float]]:
+    """
+    Returns income count, total and per-source totals, calculated by SQLite.
+
+    Same shape as get_expense_summary(), so the dashboard can treat both
+    sides the same way.
+
+    Returns:
+        Tuple of (count, total_amount, {source: total})
+        Example: (3, 6500.0, {'Salary': 5000.0, 'Freelance': 1500.0})
+
+
+    CACHED:
+    Reused until the next income write (see memoize_until_write).
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT source, SUM(amount) as total, COUNT(*) as count
+        FROM income
+        GROUP BY source
+        ORDER BY total DESC
+    ''')
+    rows = cursor.fetchall()
+    conn.close()
+
+    by_source = {row['source']: row['total'] for row in rows}
+    count = sum(row['count'] for row in rows)
+    return count, sum(by_source.values()), by_source
+
+
+@memoize_until_write('income', fallback=lambda: (0, 0.0))
+def get_income_totals() -> Tuple[int, float]:
+    """
+    Returns just the number of income records and their total.
+
+    For pages that show the two numbers without the per-source breakdown
+    of get_income_summary() - one row back instead of one per source.
+
+    Returns:
+        Tuple of (count, total_amount)
+        Example: (3, 6500.0)
+
+
+    CACHED:
+    Reused until the next income write (see memoize_until_write).
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT COUNT(*) as count, COALESCE(SUM(amount), 0.0) as total
+        FROM income
+    ''')
+    row = cursor.fetchone()
+    conn.close()
+
+    return row['count'], row['total']
+
+    """
+    COALESCE:
+    SUM() over zero rows is NULL (None in Python), not 0. COALESCE returns
+    the first value that isn't NULL, so an empty table gives 0.0.
+    SQLite reads the amounts from idx_income_source_amount, which is
+    smaller than the table itself.
+    """
+
+
+@memoize_until_write('expenses', 'income', fallback=lambda: ((0, 0.0, {}), (0, 0.0, {})))
+def get_dashboard_snapshot() -> Tuple[Tuple[int, float, Dict[str, float]],
+                                      Tuple[int, float, Dict[str, float]]]:
+    """
+    Returns the expense AND income summaries with a single query.
+
+    Same values as (get_expense_summary(), get_income_summary()), but both
+    come from one SELECT, so they always describe the same moment - an
+    expense saved between two separate queries can't make the dashboard's
+    numbers disagree with each other.
+
+    Returns:
+        Tuple of (expense_summary, income_summary), each shaped like
+        (count, total_amount, {category_or_source: total})
+
+    Example Usage:
+        (expense_count, spent, by_category), (income_count, earned, _) = get_dashboard_snapshot()
+
+
+    CACHED:
+    Reused until the next expense or income write (see memoize_until_write).
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT 'expenses' as side, category as name, SUM(total) as total, SUM(count) as count
+        FROM daily_totals
+        GROUP BY category
+        UNION ALL
+        SELECT 'income', source, SUM(amount), COUNT(*)
+        FROM income
+        GROUP BY source
+        ORDER BY side, total DESC
+    ''')
+    rows = cursor.fetchall()
+    conn.close()
+
+    """
+    UNION ALL:
+    Glues the results of two SELECTs together (they need the same number
+    of columns). The made-up `side` column tells us which half a row came
+    from; ORDER BY then sorts the combined result. UNION without ALL would
+    also remove duplicate rows - work we don't need here.
+    """
+
+    summaries = {'expenses': {}, 'income': {}}
+    counts = {'expenses': 0, 'income': 0}
+    for row in rows:
+        summaries[row['side']][row['name']] = row['total']
+        counts[row['side']] += row['count']
+
+    return tuple(
+        (counts[side], sum(summaries[side].values(), 0.0), summaries[side])
+        for side in ('expenses', 'income')
+    )
+
+
+def get_income_by_id(income_id: int) -> Optional[sqlite3.Row]:
     """
     Retrieves a single income record by its ID.
 
@@ -1038,7 +2428,7 @@ def get_income_by_id(income_id: int) -> Optional[Dict]:
         income_id: The ID of the income record to fetch
 
     Returns:
-        Dictionary containing income data, or None if not found
+        Row containing income data, or None if not found
 
     Example:
         income = get_income_by_id(5)
@@ -1055,7 +2445,7 @@ def get_income_by_id(income_id: int) -> Optional[Dict]:
         income_record = cursor.fetchone()
         conn.close()
 
-        return dict(income_record) if income_record else None
+        return income_record
 
     except sqlite3.Error as e:
         print(f"Error fetching income: {e}")
@@ -1086,23 +2476,7 @@ def update_income(income_id: int, date: str, source: str, amount: float, descrip
     Always validate on backend - never trust client input!
     """
 
-    if not date:
-        raise ValueError("Date is required")
-
-    if not source:
-        raise ValueError("Source is required")
-
-    if amount <= 0:
-        raise ValueError("Amount must be positive")
-
-    if len(description) > 500:
-        raise ValueError("Description too long. Maximum 500 characters.")
-
-    # Validate date format
-    try:
-        datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+    _validate_income(date, source, amount, description)
 
     try:
         conn = get_db_connection()
@@ -1123,8 +2497,10 @@ def update_income(income_id: int, date: str, source: str, amount: float, descrip
         - ? placeholders: Prevent SQL injection attacks
         """
 
-        conn.commit()
         success = cursor.rowcount > 0  # rowcount tells us how many rows were affected
+        conn.commit()
+        if success:
+            _mark_changed('income')  # Invalidate cached results (see delete_expense)
         conn.close()
 
         return success
@@ -1150,8 +2526,10 @@ def delete_income(income_id: int) -> bool:
 
         cursor.execute('DELETE FROM income WHERE id = ?', (income_id,))
 
-        conn.commit()
         success = cursor.rowcount > 0
+        conn.commit()
+        if success:
+            _mark_changed('income')  # Invalidate cached results (see delete_expense)
         conn.close()
 
         return success
@@ -1161,7 +2539,7 @@ def delete_income(income_id: int) -> bool:
         return False
 
 
-def get_income_by_date_range(start_date: str, end_date: str) -> List[Dict]:
+def get_income_by_date_range(start_date: str, end_date: str) -> List[sqlite3.Row]:
     """
     Retrieves income records within a specific date range.
 
@@ -1170,8 +2548,13 @@ def get_income_by_date_range(start_date: str, end_date: str) -> List[Dict]:
         end_date: End of date range (YYYY-MM-DD)
 
     Returns:
-        List of income dictionaries within the date range
+        List of income rows within the date range
     """
+    # A missing or backwards range can't match anything (see
+    # get_expenses_by_date_range)
+    if not start_date or not end_date or start_date > end_date:
+        return []
+
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -1179,26 +2562,32 @@ def get_income_by_date_range(start_date: str, end_date: str) -> List[Dict]:
         cursor.execute('''
             SELECT * FROM income
             WHERE date BETWEEN ? AND ?
-            ORDER BY date DESC
+            ORDER BY date DESC, id DESC
         ''', (start_date, end_date))
 
         income_records = cursor.fetchall()
         conn.close()
 
-        return [dict(record) for record in income_records]
+        return income_records
 
     except sqlite3.Error as e:
         print(f"Error fetching income by date range: {e}")
         return []
 
 
+# Stand-ins for a missing date bound (stored dates are always YYYY-MM-DD)
+_NO_START_DATE = ''
+_NO_END_DATE = '9999-12-31'
+
+
+@memoize_until_write('income', fallback=float)
 def get_total_income(start_date: str = None, end_date: str = None) -> float:
     """
     Calculates total income, optionally within a date range.
 
     Args:
-        start_date: Optional start date (YYYY-MM-DD)
-        end_date: Optional end date (YYYY-MM-DD)
+        start_date: Optional start date (YYYY-MM-DD), inclusive
+        end_date: Optional end date (YYYY-MM-DD), inclusive
 
     Returns:
         Total income amount
@@ -1210,32 +2599,57 @@ def get_total_income(start_date: str = None, end_date: str = None) -> float:
         # Get October 2025 income
         total = get_total_income('2025-10-01', '2025-10-31')
 
+        # Everything since 2025 began (leave out the other bound)
+        total = get_total_income(start_date='2025-01-01')
+
     JUNIOR DEV NOTES:
     - SUM() is a SQL aggregate function that adds up all values
     - COALESCE() returns the first non-NULL value (handles case where no income exists)
-    - If start_date/end_date not provided, calculates total for all time
+    - A bound that isn't provided means "no limit on that side", so with
+      neither you get the total for all time
+    - Cached until the next income write (see memoize_until_write);
+      errors return 0.0 and are not cached
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    # A backwards range can't match anything (see get_expenses_by_date_range)
+    if start_date and end_date and start_date > end_date:
+        return 0.0
 
-        if start_date and end_date:
-            cursor.execute('''
-                SELECT COALESCE(SUM(amount), 0) as total
-                FROM income
-                WHERE date BETWEEN ? AND ?
-            ''', (start_date, end_date))
-        else:
-            cursor.execute('SELECT COALESCE(SUM(amount), 0) as total FROM income')
+    conn = get_db_connection()
+    cursor = conn.cursor()
 
-        result = cursor.fetchone()
-        conn.close()
+    if not start_date and not end_date:
+        # All time: no date filter at all, so every row counts
+        cursor.execute('SELECT COALESCE(SUM(amount), 0) as total FROM income')
+    else:
+        cursor.execute('''
+            SELECT COALESCE(SUM(amount), 0) as total
+            FROM income
+            WHERE date BETWEEN ? AND ?
+        ''', (start_date or _NO_START_DATE, end_date or _NO_END_DATE))
 
-        return float(result['total'])
+    result = cursor.fetchone()
+    conn.close()
 
-    except sqlite3.Error as e:
-        print(f"Error calculating total income: {e}")
-        return 0.0
+    return float(result['total'])
+
+    """
+    ONE QUERY FOR EVERY RANGE:
+    A missing bound is replaced by a date that every real date is after
+    ('') or before ('9999-12-31'), so "a range", "only a start" and "only
+    an end" are the same SQL text. sqlite3 caches prepared statements by
+    their text, so it is prepared once per connection, and it always
+    searches the date index (idx_income_date).
+
+    WHY IS "ALL TIME" SEPARATE?
+    The income table has no CHECK on its date column, so a row added
+    outside the app could hold a date like 'Oct 1, 2025', which sorts after
+    '9999-12-31'. A date range rightly skips it, but the all-time total
+    must not - so with no bounds at all there is no WHERE clause.
+
+    Why not WHERE (? IS NULL OR date >= ?)? SQLite picks its plan once,
+    before it knows the values, and that OR stops it from using the index
+    for the date range - every call would read the whole table.
+    """
 
 
 # ============================================================================
@@ -32,17 +32,31 @@ This is an example of the "Model" in MVC (Model-View-Controller) architecture:
 # IMPORTS
 # ============================================================================
 
+import calendar
+import math
+import re
+import sys
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from operator import attrgetter
+from typing import Iterable, List, Dict, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from types import MappingProxyType
 
 """
 IMPORT EXPLANATIONS:
+- calendar: monthrange() tells us how many days a month has
+- defaultdict: A dict that fills in missing keys by itself (grouping)
+- math: fsum() for accurate float totals
+- re: Regular expressions (pattern matching for date strings)
+- sys: version_info, to use newer dataclass options only where they exist
 - datetime, timedelta: Date/time handling
+- attrgetter: Fast C-level "get this attribute" function (used with map)
 - typing: Type hints for better code documentation
 - dataclasses: Decorator that auto-generates boilerplate code for classes
 - enum: Creates named constants (more about this below)
+- MappingProxyType: Read-only view of a dictionary (for cached lookups)
 """
 
 # ============================================================================
@@ -97,7 +111,7 @@ class ExpenseCategory(Enum):
         self.color = color
 
     @classmethod
-    def get_all_categories(cls) -> List[Tuple[str, str]]:
+    def get_all_categories(cls) -> Tuple[Tuple[str, str], ...]:
         """
         Returns all categories as (name, color) tuples.
 
@@ -106,13 +120,13 @@ class ExpenseCategory(Enum):
         ExpenseCategory.get_all_categories() not expense.get_all_categories()
 
         Returns:
-            List of (display_name, color) tuples
+            Tuple of (display_name, color) tuples (built once, see below)
 
         Example Usage:
             categories = ExpenseCategory.get_all_categories()
-            # [('Food & Dining', '#FF6B6B'), ('Transportation', '#4ECDC4'), ...]
+            # (('Food & Dining', '#FF6B6B'), ('Transportation', '#4ECDC4'), ...)
         """
-        return [(cat.display_name, cat.color) for cat in cls]
+        return cls._ALL
 
     @classmethod
     def get_by_name(cls, name: str) -> Optional['ExpenseCategory']:
@@ -130,24 +144,48 @@ class ExpenseCategory(Enum):
             if cat:
                 print(f"Color: {cat.color}")
         """
-        for category in cls:
-            if category.display_name == name:
-                return category
-        return None
+        return cls._BY_NAME.get(name)  # One hash lookup (table built below)
 
     @classmethod
-    def get_category_dict(cls) -> Dict[str, str]:
+    def get_category_dict(cls) -> Mapping[str, str]:
         """
         Returns a dictionary mapping category names to colors.
 
         Returns:
-            Dict mapping display names to color codes
+            Read-only dict mapping display names to color codes
 
         Example Usage:
             colors = ExpenseCategory.get_category_dict()
             food_color = colors['Food & Dining']  # '#FF6B6B'
         """
-        return {cat.display_name: cat.color for cat in cls}
+        return cls._DICT
+
+
+# Enum members never change, so the lookups above are computed ONCE here
+# instead of looping over the enum on every call. They are attached after
+# the class body because any name assigned INSIDE an Enum body (even one
+# starting with an underscore) would become another enum member.
+ExpenseCategory._ALL = tuple((cat.display_name, cat.color) for cat in ExpenseCategory)
+ExpenseCategory._DICT = MappingProxyType(dict(ExpenseCategory._ALL))
+ExpenseCategory._BY_NAME = MappingProxyType({cat.display_name: cat for cat in ExpenseCategory})
+
+# Category names only, for "is this a valid category?" checks
+_VALID_CATEGORIES = frozenset(ExpenseCategory._DICT)
+_VALID_CATEGORIES_TEXT = ', '.join(ExpenseCategory._DICT)  # For error messages, in enum order
+
+"""
+WHY A TUPLE AND A MappingProxyType?
+Every caller gets the SAME object back, so it must not be modifiable -
+otherwise one caller could accidentally change the categories for everyone.
+- tuple: an immutable list
+- MappingProxyType: a read-only view of a dict (reading works exactly like
+  a dict, assigning raises TypeError)
+Need a normal dict (e.g. for json.dumps)? Use dict(get_category_dict()).
+
+WHY A frozenset FOR VALIDATION?
+`name in some_list` compares against every item one by one; `name in
+some_set` is a single hash lookup, however many categories there are.
+"""
 
 
 class IncomeSource(Enum):
@@ -197,18 +235,19 @@ class IncomeSource(Enum):
         self.color = color
 
     @classmethod
-    def get_all_sources(cls) -> List[Tuple[str, str]]:
+    def get_all_sources(cls) -> Tuple[Tuple[str, str], ...]:
         """
         Returns all income sources as (name, color) tuples.
 
         Returns:
-            List of (display_name, color) tuples
+            Tuple of (display_name, color) tuples (built once, like
+            ExpenseCategory.get_all_categories)
 
         Example:
             sources = IncomeSource.get_all_sources()
-            # [('Salary', '#10B981'), ('Freelance', '#3B82F6'), ...]
+            # (('Salary', '#10B981'), ('Freelance', '#3B82F6'), ...)
         """
-        return [(source.display_name, source.color) for source in cls]
+        return cls._ALL
 
     @classmethod
     def get_by_name(cls, name: str) -> Optional['IncomeSource']:
@@ -221,31 +260,61 @@ class IncomeSource(Enum):
         Returns:
             IncomeSource enum member, or None if not found
         """
-        for source in cls:
-            if source.display_name == name:
-                return source
-        return None
+        return cls._BY_NAME.get(name)
 
     @classmethod
-    def get_source_dict(cls) -> Dict[str, str]:
+    def get_source_dict(cls) -> Mapping[str, str]:
         """
         Returns dictionary mapping source names to colors.
 
         Returns:
-            Dictionary: {source_name: color}
+            Read-only dict: {source_name: color}
 
         Example:
             colors = IncomeSource.get_source_dict()
             salary_color = colors['Salary']  # '#10B981'
         """
-        return {source.display_name: source.color for source in cls}
+        return cls._DICT
+
+
+# Built once, for the same reasons as the ExpenseCategory tables above
+IncomeSource._ALL = tuple((src.display_name, src.color) for src in IncomeSource)
+IncomeSource._DICT = MappingProxyType(dict(IncomeSource._ALL))
+IncomeSource._BY_NAME = MappingProxyType({src.display_name: src for src in IncomeSource})
+
+# Source names only, for "is this a valid source?" checks (see _VALID_CATEGORIES)
+_VALID_SOURCES = frozenset(IncomeSource._DICT)
+_VALID_SOURCES_TEXT = ', '.join(IncomeSource._DICT)
 
 
 # ============================================================================
 # DATA CLASSES - Structured Data
 # ============================================================================
 
-@dataclass
+def _slots_dataclass(cls=None, **options):
+    """@dataclass(slots=True, **options) on Python 3.10+, without slots before that."""
+    if sys.version_info >= (3, 10):
+        options['slots'] = True
+    return dataclass(cls, **options)
+
+"""
+WHAT ARE __slots__?
+A normal object keeps its attributes in its own dictionary (__dict__).
+With slots=True, @dataclass gives the class a fixed list of attribute
+"slots" instead: each object is smaller (no dictionary per object) and
+reading expense.amount is a little faster. Handy when thousands of
+expenses are handed to ExpenseAnalyzer at once.
+
+The catch: you can only set the fields listed in the class. For example,
+expense.note = 'x' raises AttributeError - add a field instead.
+
+Python 3.8/3.9 don't have slots=True (and a hand-written __slots__ clashes
+with the field defaults), so there these stay ordinary dataclasses - they
+just use a bit more memory.
+"""
+
+
+@_slots_dataclass
 class Expense:
     """
     Represents a single expense record.
@@ -300,14 +369,14 @@ class Expense:
 
         # If date not provided, use today
         if not self.date:
-            self.date = datetime.now().strftime('%Y-%m-%d')
+            self.date = datetime.now().date().isoformat()
 
         """
-        STRFTIME FORMAT CODES:
-        %Y = 4-digit year (2025)
-        %m = 2-digit month (10)
-        %d = 2-digit day (01)
-        Result: '2025-10-01'
+        isoformat() vs strftime('%Y-%m-%d'):
+        Both give '2025-10-01'. isoformat() always produces exactly that
+        format, so it doesn't need to read a format string - it is about
+        4x faster, which adds up when many objects are created at once.
+        Same idea as parse_iso_date, in the other direction.
         """
 
     def to_dict(self) -> Dict:
@@ -384,8 +453,8 @@ class Expense:
             expense = Expense(category='Food & Dining', amount=25.50)
             color = expense.get_category_color()  # '#FF6B6B'
         """
-        category_enum = ExpenseCategory.get_by_name(self.category)
-        return category_enum.color if category_enum else '#BDC3C7'  # Default to gray
+        # Straight from the {name: color} table - no enum member needed
+        return ExpenseCategory._DICT.get(self.category, '#BDC3C7')  # Default to gray
 
     def formatted_amount(self) -> str:
         """
@@ -424,19 +493,20 @@ class Expense:
                 print("This is a recent expense")
         """
         try:
-            expense_date = datetime.strptime(self.date, '%Y-%m-%d')
-            days_ago = datetime.now() - timedelta(days=days)
-            return expense_date >= days_ago
+            expense_day = parse_iso_date(self.date).toordinal()  # Much cheaper than strptime
+            return expense_day > datetime.now().toordinal() - days
 
             """
-            STRPTIME vs STRFTIME:
-            - strptime: Parse string TO datetime object ('2025-10-01'  datetime)
-            - strftime: Format datetime TO string (datetime  '2025-10-01')
-            Think: p = parse, f = format
-
-            TIMEDELTA:
-            Represents a duration. timedelta(days=7) = 7 days
-            We can subtract timedelta from datetime to go back in time
+            PARSING vs FORMATTING:
+            - parse_iso_date: Parse string TO datetime object ('2025-10-01' -> datetime)
+              (see its docstring for why we don't use strptime here)
+            - strftime: Format datetime TO string (datetime -> '2025-10-01')
+
+            toordinal():
+            Turns a date into a day number (1 = January 1st of year 1), so
+            "N days ago" is just today's number minus N - plain integer
+            math, no timedelta or time-of-day involved. With days=7 that
+            means today and the 6 days before it, as before.
             """
 
         except ValueError:
@@ -444,7 +514,7 @@ class Expense:
             return False
 
 
-@dataclass
+@_slots_dataclass(frozen=True)
 class Budget:
     """
     Represents a budget limit for a category.
@@ -454,6 +524,13 @@ class Budget:
     - category: Which expense category this budget applies to
     - monthly_limit: Maximum allowed spending per month
     - created_at: When budget was created
+
+    FROZEN:
+    frozen=True makes a Budget read-only once it is created:
+    budget.monthly_limit = 100 raises FrozenInstanceError. To change a
+    limit, save it with database.set_budget() (or build a new Budget with
+    dataclasses.replace()). Read-only objects can be shared safely and are
+    hashable, so they work as dict keys, in sets, or with lru_cache.
     """
 
     id: Optional[int] = None
@@ -493,7 +570,7 @@ class Budget:
         return f"${self.monthly_limit:.2f}"
 
 
-@dataclass
+@_slots_dataclass
 class Income:
     """
     Represents a single income record.
@@ -549,7 +626,7 @@ class Income:
 
         # If date not provided, use today (consistent with Expense class)
         if not self.date:
-            self.date = datetime.now().strftime('%Y-%m-%d')
+            self.date = datetime.now().date().isoformat()
 
         if not self.source:
             raise ValueError("Source is required")
@@ -629,11 +706,10 @@ class Income:
             color = income.get_source_color()  # '#10B981' (green)
 
         JUNIOR DEV NOTE:
-        We look up the source in our IncomeSource enum to get its color.
+        We look up the source in IncomeSource's {name: color} table.
         If source isn't found (maybe it's old data), we return gray as default.
         """
-        source_enum = IncomeSource.get_by_name(self.source)
-        return source_enum.color if source_enum else '#94A3B8'  # Default gray
+        return IncomeSource._DICT.get(self.source, '#94A3B8')  # Default gray
 
     def get_month_year(self) -> str:
         """
@@ -657,6 +733,10 @@ class Income:
 # BUSINESS LOGIC - Calculations and Analysis
 # ============================================================================
 
+# Reads .amount from an Expense/Income (see ExpenseAnalyzer.calculate_total)
+_get_amount = attrgetter('amount')
+
+
 class ExpenseAnalyzer:
     """
     Provides analysis and calculation methods for expenses.
@@ -685,13 +765,18 @@ class ExpenseAnalyzer:
             expenses = [Expense(amount=25.50), Expense(amount=30.00)]
             total = ExpenseAnalyzer.calculate_total(expenses)  # 55.50
         """
-        return sum(expense.amount for expense in expenses)
+        return math.fsum(map(_get_amount, expenses))
 
         """
-        GENERATOR EXPRESSION:
-        (expense.amount for expense in expenses)
-        Similar to list comprehension but uses () instead of []
-        More memory efficient for large datasets
+        map(_get_amount, expenses):
+        _get_amount is operator.attrgetter('amount') - a small C function
+        that reads expense.amount. map() calls it for each expense without
+        running a line of Python per item (unlike a generator expression).
+
+        math.fsum vs sum:
+        sum() adds floats one at a time and rounding errors pile up
+        (0.1 + 0.2 = 0.30000000000000004). fsum() tracks the lost digits
+        and returns the correctly rounded total - what you want for money.
         """
 
     @staticmethod
@@ -737,24 +822,20 @@ class ExpenseAnalyzer:
             grouped = ExpenseAnalyzer.group_by_category(expenses)
             # {'Food': [Expense(amount=25), Expense(amount=30)], ...}
         """
-        grouped = {}
+        grouped = defaultdict(list)
 
         for expense in expenses:
-            if expense.category not in grouped:
-                grouped[expense.category] = []
             grouped[expense.category].append(expense)
 
-        return grouped
-
-        """
-        ALTERNATIVE USING defaultdict:
-        from collections import defaultdict
-        grouped = defaultdict(list)
-        for expense in expenses:
-            grouped[expense.category].append(expense)
         return dict(grouped)
 
-        defaultdict automatically creates empty list if key doesn't exist.
+        """
+        defaultdict(list):
+        Works like a normal dict, except that reading a missing key first
+        stores an empty list under it. So there is no "if category not in
+        grouped" check: one lookup per expense instead of up to three.
+        dict(grouped) hands back a plain dict, so a later typo like
+        grouped['Fod'] raises KeyError instead of quietly adding a group.
         """
 
     @staticmethod
@@ -774,15 +855,21 @@ class ExpenseAnalyzer:
             # {'Food': 55.0, ...}
         """
         totals = {}
+        get = totals.get  # Look the method up once, not once per expense
 
         for expense in expenses:
-            if expense.category in totals:
-                totals[expense.category] += expense.amount
-            else:
-                totals[expense.category] = expense.amount
+            category = expense.category
+            totals[category] = get(category, 0.0) + expense.amount
 
         return totals
 
+        """
+        ONE DICTIONARY LOOKUP PER EXPENSE:
+        The old "if category in totals: ... += ... else: ... =" looked the
+        key up twice (three times when adding). get(category, 0.0) finds
+        the current total - or 0.0 for a new category - in one go.
+        """
+
     @staticmethod
     def get_monthly_total(expenses: List[Expense], year: int, month: int) -> float:
         """
@@ -800,24 +887,25 @@ class ExpenseAnalyzer:
             total = ExpenseAnalyzer.get_monthly_total(expenses, 2025, 10)
             print(f"October 2025 spending: ${total:.2f}")
         """
-        # Filter expenses for specified month
-        monthly_expenses = [
-            exp for exp in expenses
-            if exp.date.startswith(f"{year}-{month:02d}")
-        ]
+        # Build the 'YYYY-MM-' prefix ONCE, not once per expense
+        prefix = f"{year}-{month:02d}-"
+
+        return math.fsum(
+            exp.amount for exp in expenses
+            if exp.date.startswith(prefix)
+        )
 
         """
-        LIST COMPREHENSION WITH CONDITION:
-        [item for item in list if condition]
-        Only includes items where condition is True
+        GENERATOR WITH CONDITION:
+        (item for item in list if condition)
+        Only includes items where condition is True. Feeding it straight to
+        fsum adds the amounts as they come, without building a list first.
 
         STRING FORMATTING:
         {month:02d} formats month as 2-digit number with leading zero
         1 becomes '01', 12 stays '12'
         """
 
-        return ExpenseAnalyzer.calculate_total(monthly_expenses)
-
     @staticmethod
     def get_budget_status(expenses: List[Expense], budgets: List[Budget],
                           year: int, month: int) -> Dict[str, Dict]:
@@ -837,7 +925,7 @@ class ExpenseAnalyzer:
             Dictionary mapping categories to status info:
             {
                 'Food & Dining': {
-                    'budget': 500.0,
+                    'limit': 500.0,
                     'spent': 350.0,
                     'remaining': 150.0,
                     'percentage': 70.0,
@@ -853,19 +941,28 @@ class ExpenseAnalyzer:
         """
         result = {}
 
-        # Filter expenses for the specified month
-        month_expenses = [
-            exp for exp in expenses
-            if exp.date.startswith(f"{year}-{month:02d}")
-        ]
+        # Add up this month's spending for the budgeted categories only,
+        # in ONE pass ('YYYY-MM-' built once, like get_monthly_total)
+        prefix = f"{year}-{month:02d}-"
+        category_totals = {budget.category: 0.0 for budget in budgets}
 
-        # Group expenses by category
-        category_totals = ExpenseAnalyzer.get_category_totals(month_expenses)
+        for exp in expenses:
+            if exp.category in category_totals and exp.date.startswith(prefix):
+                category_totals[exp.category] += exp.amount
+
+        """
+        ONE PASS INSTEAD OF TWO:
+        We used to build a list of the month's expenses, then loop over
+        that list again in get_category_totals. Checking both conditions
+        in the same loop skips the extra list, and categories without a
+        budget are never added up at all. Every budgeted category starts
+        at 0.0, so a budget with no spending still shows up below.
+        """
 
         # Calculate status for each budget
         for budget in budgets:
             category = budget.category
-            spent = category_totals.get(category, 0.0)
+            spent = category_totals[category]
             remaining = budget.monthly_limit - spent
             percentage = (spent / budget.monthly_limit * 100) if budget.monthly_limit > 0 else 0
 
@@ -878,7 +975,7 @@ class ExpenseAnalyzer:
             """
 
             result[category] = {
-                'budget': budget.monthly_limit,
+                'limit': budget.monthly_limit,  # Same keys as database.get_budget_status
                 'spent': spent,
                 'remaining': remaining,
                 'percentage': round(percentage, 1),  # Round to 1 decimal place
@@ -888,12 +985,48 @@ class ExpenseAnalyzer:
         return result
 
     @staticmethod
-    def get_spending_trend(expenses: List[Expense], months: int = 6) -> Dict[str, float]:
+    def get_trend_window(months: int = 6) -> Tuple[str, str]:
+        """
+        Returns the first and last day (inclusive) covered by a spending trend.
+
+        Matches get_spending_trend: everything after the same day N months
+        ago, up to and including today.
+
+        Args:
+            months: Number of months to go back (default 6)
+
+        Returns:
+            Tuple of (start_date, end_date) strings in YYYY-MM-DD format
+
+        Example Usage:
+            start, end = ExpenseAnalyzer.get_trend_window(6)
+            # On 2025-10-15: ('2025-04-16', '2025-10-15')
+        """
+        today = datetime.now()
+        year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+        month += 1
+
+        # Day 31 doesn't exist in every month - use the month's last day instead
+        day = min(today.day, calendar.monthrange(year, month)[1])
+        start = datetime(year, month, day) + timedelta(days=1)
+
+        return start.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+
+        """
+        MONTH ARITHMETIC WITH divmod:
+        Counting months from year 0 (year * 12 + month - 1) turns "go back N
+        months" into a plain subtraction; divmod(total, 12) splits it back
+        into (year, month - 1). No loop needed for year boundaries.
+        """
+
+    @staticmethod
+    def get_spending_trend(expenses: Iterable[Expense], months: int = 6) -> Dict[str, float]:
         """
         Calculates spending trend over the last N months.
 
         Args:
-            expenses: List of Expense objects
+            expenses: Expense objects - a list, or a generator that produces
+                them one at a time (each is looked at only once)
             months: Number of months to analyze (default 6)
 
         Returns:
@@ -905,46 +1038,29 @@ class ExpenseAnalyzer:
         """
         trend = {}
 
-        # Calculate date range using proper month arithmetic
-        end_date = datetime.now()
+        # Same window as the SQL version (database.get_monthly_totals)
+        start_date, end_date = ExpenseAnalyzer.get_trend_window(months)
 
-        # Calculate start date by going back N months
-        # Handle year/month boundaries correctly
-        start_year = end_date.year
-        start_month = end_date.month - months
-
-        # Adjust for negative months (go back to previous year)
-        while start_month <= 0:
-            start_month += 12
-            start_year -= 1
+        for expense in expenses:
+            date = expense.date
 
-        start_date = end_date.replace(year=start_year, month=start_month)
+            # YYYY-MM-DD strings sort like the dates they stand for, so the
+            # window check and the month key need no date parsing at all
+            if start_date <= date <= end_date and _ISO_DATE.fullmatch(date):
+                month_key = date[:7]  # '2025-10-03' -> '2025-10'
+                trend[month_key] = trend.get(month_key, 0.0) + expense.amount
 
         """
-        PROPER MONTH CALCULATION:
-        Instead of approximating with 30 days, we calculate exact months.
-        This handles varying month lengths (28-31 days) and year boundaries correctly.
-        Example: 6 months back from Oct 2025 = Apr 2025 (not ~180 days back)
+        COMPARING DATES AS TEXT:
+        '2025-09-30' < '2025-10-01' is true both as dates and as strings,
+        because the year comes first and every part is zero-padded. Before,
+        each expense went through strptime() and strftime() - by far the
+        slowest part of the loop. Dates that aren't exactly YYYY-MM-DD are
+        skipped, as before (that's what the _ISO_DATE check is for).
+        get_trend_window() also clamps the day (e.g. 31 -> 30), which the
+        old end_date.replace(month=...) couldn't do.
         """
 
-        for expense in expenses:
-            try:
-                expense_date = datetime.strptime(expense.date, '%Y-%m-%d')
-
-                # Check if expense is within date range
-                if start_date <= expense_date <= end_date:
-                    # Get year-month string (e.g., '2025-10')
-                    month_key = expense_date.strftime('%Y-%m')
-
-                    if month_key in trend:
-                        trend[month_key] += expense.amount
-                    else:
-                        trend[month_key] = expense.amount
-
-            except ValueError:
-                # Skip expenses with invalid dates
-                continue
-
         # Sort by month (oldest to newest)
         return dict(sorted(trend.items()))
 
@@ -960,6 +1076,45 @@ class ExpenseAnalyzer:
 # UTILITY FUNCTIONS
 # ============================================================================
 
+# Exactly YYYY-MM-DD with ASCII digits (\d would also accept e.g. Arabic digits)
+_ISO_DATE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+
+def parse_iso_date(text: str) -> datetime:
+    """
+    Parses a 'YYYY-MM-DD' date string.
+
+    Args:
+        text: Date string, e.g. '2025-10-01'
+
+    Returns:
+        datetime for midnight of that day
+
+    Raises:
+        ValueError: If the text isn't exactly YYYY-MM-DD or isn't a real
+                    date (e.g. '2025-02-30')
+
+    Example Usage:
+        parse_iso_date('2025-10-01')  # datetime(2025, 10, 1, 0, 0)
+        parse_iso_date('10/01/2025')  # ValueError
+    """
+    if not _ISO_DATE.fullmatch(text):
+        raise ValueError(f"Invalid date format: {text!r}")
+    return datetime.fromisoformat(text)
+
+    """
+    WHY NOT strptime?
+    strptime(text, '%Y-%m-%d') re-reads the format string on every call
+    and goes through locale-aware parsing, which makes it one of the
+    slower functions in the standard library. fromisoformat() handles
+    exactly this one format in C. The regex comes first because
+    fromisoformat() also accepts other ISO spellings ('20251001',
+    '2025-10-01T12:00') that we don't want to store. It is also stricter
+    than strptime, which let '2025-1-5' through; unpadded dates would
+    sort wrongly in the database, where dates are compared as text.
+    """
+
+
 def validate_expense_data(date: str, category: str, amount: float,
                          description: str = "") -> Tuple[bool, str]:
     """
@@ -988,16 +1143,7 @@ def validate_expense_data(date: str, category: str, amount: float,
             show_error_to_user(error)
     """
 
-    # Validate date format
-    try:
-        datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        return False, "Invalid date format. Use YYYY-MM-DD (e.g., 2025-10-01)"
-
-    # Validate category
-    valid_categories = [cat.display_name for cat in ExpenseCategory]
-    if category not in valid_categories:
-        return False, f"Invalid category. Must be one of: {', '.join(valid_categories)}"
+    # Cheapest checks first (see CHECK ORDER below) - keep it that way
 
     # Validate amount
     if amount <= 0:
@@ -1006,20 +1152,88 @@ def validate_expense_data(date: str, category: str, amount: float,
     if amount >= 10000000:  # Sanity check for very large amounts (>= to reject 10M and above)
         return False, "Amount seems unreasonably large (>= $10,000,000). Please verify."
 
-    # Validate description length
+    # Validate description length (a str knows its length - len() never
+    # reads the text, however long it is)
+    if not isinstance(description, str):
+        return False, "Description must be text."
+
     if len(description) > 500:
         return False, "Description too long. Maximum 500 characters."
 
+    # Validate category
+    if category not in _VALID_CATEGORIES:
+        return False, f"Invalid category. Must be one of: {_VALID_CATEGORIES_TEXT}"
+
+    # Validate date format
+    try:
+        parse_iso_date(date)
+    except ValueError:
+        return False, "Invalid date format. Use YYYY-MM-DD (e.g., 2025-10-01)"
+
     # All validations passed
     return True, ""
 
     """
     VALIDATION BEST PRACTICES:
-    1. Check format (date, email, etc.)
-    2. Check range (amount > 0, length < max)
-    3. Check against allowed values (category in list)
+    1. Check range (amount > 0, length < max)
+    2. Check against allowed values (category in list)
+    3. Check format (date, email, etc.)
     4. Return clear error messages that help user fix the problem
     5. Validate on both frontend (quick feedback) and backend (security)
+
+    CHECK ORDER:
+    The checks run from cheapest to most expensive: number comparisons,
+    then a string length, then one set lookup, and parsing the date last.
+    Invalid input usually stops at the first cheap check and never pays
+    for the date parse. The order only decides WHICH message you see when
+    several fields are wrong at once - every check still runs before
+    (True, "") is returned.
+    """
+
+
+def parse_expense_form(form: Mapping[str, str]) -> Tuple[Optional[Expense], str]:
+    """
+    Reads and validates the add/edit expense form in one step.
+
+    Args:
+        form: Submitted form fields (Flask's request.form)
+
+    Returns:
+        Tuple of (expense, error_message)
+        - (Expense(...), "") if the form is valid (id is None)
+        - (None, "error message") if it isn't
+
+    Example Usage:
+        expense, error = parse_expense_form(request.form)
+        if expense is None:
+            flash(error, 'error')
+    """
+    date = form.get('date', '')
+    category = form.get('category', '')
+    description = form.get('description', '')
+
+    try:
+        amount = float(form.get('amount', '0'))
+    except ValueError:
+        return None, "Amount must be a valid number"
+
+    # float() also accepts 'nan' and 'inf', which aren't amounts of money
+    if not math.isfinite(amount):
+        return None, "Amount must be a valid number"
+
+    is_valid, error_message = validate_expense_data(date, category, amount, description)
+    if not is_valid:
+        return None, error_message
+
+    return Expense(date=date, category=category, amount=amount,
+                   description=description), ""
+
+    """
+    WHY ONE FUNCTION?
+    Adding and editing an expense read the same four fields, convert the
+    amount the same way and run the same checks. Doing it in one place
+    means the two forms can't drift apart (e.g. a new rule added to one
+    route but forgotten in the other).
     """
 
 
@@ -1034,9 +1248,13 @@ def format_currency(amount: float) -> str:
         Formatted currency string
 
     Example Usage:
-        formatted = format_currency(1234.5)  # '$1,234.50'
+        formatted = format_currency(1234.5)   # '$1,234.50'
+        formatted = format_currency(-42)      # '-$42.00'
     """
-    return f"${amount:,.2f}"
+    if amount >= 0:
+        return f"${amount:,.2f}"
+    text = f"{-amount:,.2f}"
+    return '$' + text if text == '0.00' else '-$' + text
 
     """
     FORMATTING FLAGS:
@@ -1044,6 +1262,17 @@ def format_currency(amount: float) -> str:
     - : starts format specification
     - , adds thousand separators (1234 becomes 1,234)
     - .2f formats as float with 2 decimal places
+
+    NEGATIVE AMOUNTS:
+    f"${-42:,.2f}" would give '$-42.00'. The usual way to write it is
+    '-$42.00', so the sign goes in front of the dollar sign.
+    (A deficit on the dashboard is the common case.)
+    Tiny negatives that round to zero (-0.001) print as '$0.00', not '-$0.00'.
+
+    WHY NOT locale OR babel?
+    Locale-aware formatting is much slower and this app is USD-only.
+    This function runs for nearly every money value on every page, so a
+    comparison plus one f-string is all it does.
     """
 
 
@@ -1086,29 +1315,7 @@ def validate_income_data(date: str, source: str, amount: float,
     - Use tuple return (bool, str) pattern for validation functions
     - Keep validation logic separate from business logic
     """
-    # Validate date format
-    try:
-        datetime.strptime(date, '%Y-%m-%d')
-        # strptime = "string parse time" - converts string to datetime object
-        # If parsing fails, raises ValueError
-    except ValueError:
-        return False, "Invalid date format. Use YYYY-MM-DD (e.g., 2025-10-01)"
-        # Return tuple: (False, error_message) to indicate validation failed
-
-    # Validate source is not empty
-    if not source:
-        return False, "Source is required"
-        # Check for empty string before validating against enum
-
-    # Validate source against enum
-    valid_sources = [source.display_name for source in IncomeSource]
-    # List comprehension: Extract display_name from each enum member
-    # Result: ['Salary', 'Freelance', 'Business', 'Investment', 'Gift', 'Refund', 'Bonus', 'Other']
-
-    if source not in valid_sources:
-        return False, f"Invalid source. Must be one of: {', '.join(valid_sources)}"
-        # f-string: Inserts list of valid sources into error message
-        # ', '.join(): Converts list to comma-separated string
+    # Cheapest checks first, date last (see CHECK ORDER in validate_expense_data)
 
     # Validate amount (positive and reasonable)
     if amount <= 0:
@@ -1121,15 +1328,45 @@ def validate_income_data(date: str, source: str, amount: float,
         # Note: >= means 10M and above are rejected
 
     # Validate description length
+    if not isinstance(description, str):
+        return False, "Description must be text."
+        # e.g. None or bytes - len() would mean something else (or crash)
+
     if len(description) > 500:
         return False, "Description too long. Maximum 500 characters."
         # Prevents database bloat and potential DoS attacks
 
+    # Validate source is not empty
+    if not source:
+        return False, "Source is required"
+        # Check for empty string before validating against enum
+
+    # Validate source against enum
+    if source not in _VALID_SOURCES:
+        # One hash lookup in a set built once at import (see _VALID_SOURCES)
+        return False, f"Invalid source. Must be one of: {_VALID_SOURCES_TEXT}"
+        # Valid names are listed in enum order:
+        # 'Salary, Freelance, Business, Investment, Gift, Refund, Bonus, Other'
+
+    # Validate date format
+    try:
+        parse_iso_date(date)
+        # Converts 'YYYY-MM-DD' to a datetime object
+        # If parsing fails, raises ValueError
+    except ValueError:
+        return False, "Invalid date format. Use YYYY-MM-DD (e.g., 2025-10-01)"
+        # Return tuple: (False, error_message) to indicate validation failed
+
     # All validations passed
     return True, ""
     # Return (True, "") indicates success with no error message
 
 
+# English month names, index 0 = January (what strftime('%B') gives us)
+_MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December')
+
+
 def get_date_range_description(start_date: str, end_date: str) -> str:
     """
     Returns a human-readable description of a date range.
@@ -1146,23 +1383,34 @@ def get_date_range_description(start_date: str, end_date: str) -> str:
         # 'October 2025'
     """
     try:
-        start = datetime.strptime(start_date, '%Y-%m-%d')
-        end = datetime.strptime(end_date, '%Y-%m-%d')
+        start = parse_iso_date(start_date)
+        end = parse_iso_date(end_date)
+
+        start_month = _MONTH_NAMES[start.month - 1]
+        end_month = _MONTH_NAMES[end.month - 1]
 
         # If same month, return month name and year
         if start.year == end.year and start.month == end.month:
-            return start.strftime('%B %Y')  # 'October 2025'
+            return f"{start_month} {start.year}"  # 'October 2025'
 
         # If same year, return month range
         if start.year == end.year:
-            return f"{start.strftime('%B')} - {end.strftime('%B %Y')}"  # 'August - October 2025'
+            return f"{start_month} - {end_month} {end.year}"  # 'August - October 2025'
 
         # Different years
-        return f"{start.strftime('%B %Y')} - {end.strftime('%B %Y')}"  # 'December 2024 - February 2025'
+        return f"{start_month} {start.year} - {end_month} {end.year}"  # 'December 2024 - February 2025'
 
     except ValueError:
         return f"{start_date} to {end_date}"
 
+    """
+    WHY NOT strftime('%B %Y')?
+    strftime reads its format string on every call and asks the system
+    locale for the month name. A tuple lookup gives the same English name
+    directly (the app never changes the locale, so strftime would say
+    'October' too).
+    """
+
 
 # ============================================================================
 # MAIN EXECUTION - FOR TESTING
@@ -47,6 +47,483 @@ try:
 except Exception as e:
     print(f"   Income date validation: {e}")
 
+# The checks below run against a throw-away database file, never finance.db
+import os
+import sqlite3
+import tempfile
+import database
+
+
+def use_temp_database():
+    """Points database.py at a new, empty database file and returns its path."""
+    database.DATABASE_NAME = os.path.join(tempfile.mkdtemp(), 'test.db')
+    return database.DATABASE_NAME
+
+
+# Test 5: Upgrading an expenses table from before the CHECK rules
+print("\n5. Testing expense CHECK rules and the legacy upgrade:")
+path = use_temp_database()
+conn = sqlite3.connect(path)
+conn.execute('''
+    CREATE TABLE expenses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        category TEXT NOT NULL,
+        amount REAL NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+''')
+conn.execute("INSERT INTO expenses (date, category, amount) VALUES ('2025-10-01', 'Shopping', 20)")
+conn.execute("INSERT INTO expenses (date, category, amount) VALUES ('2025-10-02', 'Shopping', -5)")
+conn.commit()
+conn.close()
+
+database.init_db()  # The -5 row breaks the rules: table kept, version not stamped
+conn = sqlite3.connect(path)
+version = conn.execute('PRAGMA user_version').fetchone()[0]
+conn.close()
+print(f"   Version not stamped after failed upgrade: {version} [PASS]"
+      if version != database.SCHEMA_VERSION else "   FAIL: upgrade would never run again")
+
+try:
+    database.add_expense('garbage', '', -100, 'x' * 900)
+    print("   FAIL: bad expense saved on the old table")
+except ValueError:
+    print("   Bad expense rejected without CHECK rules [PASS]")
+
+conn = sqlite3.connect(path)
+conn.execute('DELETE FROM expenses WHERE amount <= 0')
+conn.commit()
+conn.close()
+
+database.init_db()  # Now the upgrade goes through
+conn = sqlite3.connect(path)
+version = conn.execute('PRAGMA user_version').fetchone()[0]
+table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'expenses'").fetchone()[0]
+conn.close()
+print("   Upgraded once the data was fixed [PASS]"
+      if version == database.SCHEMA_VERSION and 'CHECK' in table_sql else "   FAIL: not upgraded")
+new_id = database.add_expense('2025-10-03', 'Shopping', 10, '')
+print(f"   Deleted IDs not reused (new ID {new_id}) [PASS]" if new_id == 3 else f"   FAIL: new ID {new_id}")
+
+# Category and date shape: the Python pre-flight check; the rest: the CHECK rules
+for bad, error in [(('2025-10-03', 'Not a category', 10, ''), ValueError),
+                   (('10/03/2025', 'Shopping', 10, ''), ValueError),
+                   (('2025-10-03', 'Shopping', 0, ''), sqlite3.IntegrityError),
+                   (('2025-10-03', 'Shopping', 10, 'x' * 501), sqlite3.IntegrityError)]:
+    try:
+        database.add_expense(*bad)
+        print(f"   FAIL: saved {bad[:3]}")
+    except error:
+        print(f"   Rejected {bad[:3]} with {error.__name__} [PASS]")
+
+# A bad amount or description is caught by exactly one layer of database.py
+for label, bad in [('zero amount', ('2025-10-03', 'Shopping', 0, '')),
+                   ('long description', ('2025-10-03', 'Shopping', 10, 'x' * 501))]:
+    try:
+        database._check_expense(bad[0], bad[1])
+        passed_preflight = True
+    except ValueError:
+        passed_preflight = False
+    try:
+        database.add_expense(*bad)
+        rejected_by_table = False
+    except sqlite3.IntegrityError:
+        rejected_by_table = True
+    print(f"   {label}: left to the CHECK rule, not the pre-flight check [PASS]"
+          if passed_preflight and rejected_by_table else f"   FAIL: {label}")
+
+# Test 6: Cached results are recomputed after every kind of write
+print("\n6. Testing cache invalidation after writes:")
+use_temp_database()
+database.init_db()
+
+
+def check_cache(label, write, expected):
+    """Runs `write`, then checks the cached expense summary shows `expected`."""
+    database.get_expense_summary()  # Fill the cache
+    write()
+    count, total, _ = database.get_expense_summary()
+    print(f"   {label}: {count} rows, {total:.2f} [PASS]" if (count, total) == expected
+          else f"   FAIL: {label} left the cache at {count} rows, {total:.2f}")
+
+
+def external_write(sql="UPDATE expenses SET amount = 50 WHERE id = 3"):
+    """A write that doesn't go through database.py (another worker, a SQLite browser)."""
+    conn = sqlite3.connect(database.DATABASE_NAME)
+    conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+check_cache('add_expense', lambda: database.add_expense('2025-10-01', 'Shopping', 10, ''), (1, 10))
+check_cache('add_expenses_bulk', lambda: database.add_expenses_bulk(
+    [('2025-10-02', 'Shopping', 20, ''), ('2025-10-03', 'Shopping', 30, '')]), (3, 60))
+check_cache('update_expense', lambda: database.update_expense(1, '2025-10-01', 'Shopping', 15, ''), (3, 65))
+check_cache('delete_expense', lambda: database.delete_expense(2), (2, 45))
+check_cache('write from another connection', external_write, (2, 65))
+
+database.get_total_income()
+database.add_income('2025-10-01', 'Salary', 1000, '')
+total = database.get_total_income()
+print(f"   add_income: {total:.2f} [PASS]" if total == 1000 else f"   FAIL: add_income left {total}")
+
+database.get_budget('Shopping')
+database.set_budget('Shopping', 200)
+budget = database.get_budget('Shopping')
+print("   set_budget: [PASS]" if budget and budget['monthly_limit'] == 200 else "   FAIL: set_budget")
+
+# Test 7: 304 Not Modified for pages that haven't changed
+print("\n7. Testing page ETags:")
+use_temp_database()
+database.init_db()
+from app import app
+client = app.test_client()
+
+first = client.get('/')
+etag = first.headers.get('ETag', '').strip('"')
+repeat = client.get('/', headers={'If-None-Match': f'"{etag}"'})
+print("   Same ETag answered with 304 [PASS]" if etag and repeat.status_code == 304
+      else f"   FAIL: got {repeat.status_code}")
+
+database.add_expense('2025-10-01', 'Shopping', 10, '')
+after_write = client.get('/', headers={'If-None-Match': f'"{etag}"'})
+print("   Fresh page after a write [PASS]" if after_write.status_code == 200
+      else f"   FAIL: got {after_write.status_code}")
+
+etag = after_write.headers.get('ETag', '').strip('"')
+external_write("DELETE FROM expenses")  # Another process changing the data must change the label too
+after_external = client.get('/', headers={'If-None-Match': f'"{etag}"'})
+print("   Fresh page after a write from another connection [PASS]"
+      if after_external.status_code == 200 else f"   FAIL: got {after_external.status_code}")
+
+# Test 8: Single-record lookups always show the current row
+print("\n8. Testing get_expense_by_id / get_income_by_id:")
+use_temp_database()
+database.init_db()
+expense_id = database.add_expense('2025-10-01', 'Shopping', 10, 'before')
+income_id = database.add_income('2025-10-01', 'Salary', 1000, 'before')
+database.get_expense_by_id(expense_id)
+database.get_income_by_id(income_id)
+external_write("UPDATE expenses SET description = 'after'")
+external_write("UPDATE income SET description = 'after'")
+expense = database.get_expense_by_id(expense_id)
+income = database.get_income_by_id(income_id)
+print("   Expense lookup sees an outside edit [PASS]" if expense['description'] == 'after'
+      else "   FAIL: stale expense row")
+print("   Income lookup sees an outside edit [PASS]" if income['description'] == 'after'
+      else "   FAIL: stale income row")
+print("   Missing IDs give None [PASS]"
+      if database.get_expense_by_id(999) is None and database.get_income_by_id(999) is None
+      else "   FAIL: missing ID returned a row")
+
+# Test 9: Error pages stay HTML; JSON requests skip the template context
+print("\n9. Testing error pages and the context processor:")
+from app import inject_categories
+for url in ['/no-such-page', '/api/no-such-endpoint']:
+    response = client.get(url)
+    print(f"   {url}: HTML 404 [PASS]"
+          if response.status_code == 404 and response.mimetype == 'text/html'
+          else f"   FAIL: {url} gave {response.status_code} {response.mimetype}")
+
+with app.test_request_context('/add'):
+    print("   Form page gets the categories [PASS]" if 'categories' in inject_categories()
+          else "   FAIL: categories missing on /add")
+for label, options in [('/api/ path', {'path': '/api/category-totals'}),
+                       ('JSON post', {'path': '/add', 'method': 'POST', 'json': {}}),
+                       ('AJAX request', {'path': '/add', 'headers': {'X-Requested-With': 'XMLHttpRequest'}}),
+                       ('Accept: JSON', {'path': '/add', 'headers': {'Accept': 'application/json'}})]:
+    with app.test_request_context(**options):
+        print(f"   {label} gets an empty context [PASS]" if inject_categories() == {}
+              else f"   FAIL: {label} got a full context")
+
+# Test 10: Writes that match no row leave the caches alone
+print("\n10. Testing update/delete of missing ids:")
+use_temp_database()
+database.init_db()
+income_id = database.add_income('2025-10-01', 'Salary', 1000, '')
+for label, write, table in [
+        ('update_expense', lambda: database.update_expense(999, '2025-10-01', 'Shopping', 5, ''), 'expenses'),
+        ('delete_expense', lambda: database.delete_expense(999), 'expenses'),
+        ('update_income', lambda: database.update_income(999, '2025-10-01', 'Salary', 5, ''), 'income'),
+        ('delete_income', lambda: database.delete_income(999), 'income'),
+        ('delete_budget', lambda: database.delete_budget('Shopping'), 'budgets')]:
+    before = database._data_version[table]
+    result = write()
+    print(f"   {label} of a missing row: nothing marked changed [PASS]"
+          if result is False and database._data_version[table] == before
+          else f"   FAIL: {label} returned {result} or marked {table} changed")
+
+before = database._data_version['income']
+changed = database.update_income(income_id, '2025-10-01', 'Salary', 1200, '')
+print("   update_income of a real row marks income changed [PASS]"
+      if changed and database._data_version['income'] != before else "   FAIL: update_income")
+before = database._data_version['income']
+deleted = database.delete_income(income_id)
+print("   delete_income of a real row marks income changed [PASS]"
+      if deleted and database._data_version['income'] != before else "   FAIL: delete_income")
+
+# Test 11: Both budget status functions describe a budget the same way
+print("\n11. Testing budget status keys:")
+from models import Budget, Expense, ExpenseAnalyzer
+use_temp_database()
+database.init_db()
+database.set_budget('Shopping', 100)
+database.add_expense('2025-10-05', 'Shopping', 40, '')
+from_sql = database.get_budget_status(2025, 10)['Shopping']
+from_python = ExpenseAnalyzer.get_budget_status(
+    [Expense(date='2025-10-05', category='Shopping', amount=40)],
+    [Budget(category='Shopping', monthly_limit=100)], 2025, 10)['Shopping']
+print(f"   Same keys and values: {sorted(from_python)} [PASS]" if from_python == from_sql
+      else f"   FAIL: {from_python} != {from_sql}")
+
+# Test 12: get_total_income with and without date bounds
+print("\n12. Testing get_total_income date bounds:")
+use_temp_database()
+database.init_db()
+database.add_income('2025-09-30', 'Salary', 100, '')
+database.add_income('2025-10-01', 'Salary', 200, '')
+database.add_income('2025-10-31', 'Salary', 400, '')
+# A row written outside the app, with a date that sorts after '9999-12-31'
+external_write("INSERT INTO income (date, source, amount) VALUES ('Oct 1, 2025', 'Gift', 800)")
+for label, args, expected in [('all time', (), 1500),
+                              ('October', ('2025-10-01', '2025-10-31'), 600),
+                              ('first day only', ('2025-10-01', '2025-10-01'), 200),
+                              ('only a start', ('2025-10-01', None), 600),
+                              ('only an end', (None, '2025-10-01'), 300),
+                              ('backwards range', ('2025-10-31', '2025-10-01'), 0)]:
+    total = database.get_total_income(*args)
+    print(f"   {label}: {total:.2f} [PASS]" if total == expected
+          else f"   FAIL: {label} gave {total}, expected {expected}")
+
+# Test 13: daily_totals always matches the expenses it summarizes
+print("\n13. Testing the daily_totals rollup:")
+use_temp_database()
+database.init_db()
+
+
+def check_daily_totals(label):
+    """Compares daily_totals with a fresh SUM/COUNT over the expenses table."""
+    conn = sqlite3.connect(database.DATABASE_NAME)
+    rollup = conn.execute(
+        'SELECT date, category, round(total, 2), count FROM daily_totals ORDER BY 1, 2').fetchall()
+    actual = conn.execute('''
+        SELECT date, category, round(SUM(amount), 2), COUNT(*) FROM expenses
+        GROUP BY date, category ORDER BY 1, 2
+    ''').fetchall()
+    conn.close()
+    print(f"   After {label}: {len(rollup)} rows match [PASS]" if rollup == actual
+          else f"   FAIL after {label}: {rollup} != {actual}")
+
+
+first = database.add_expense('2025-10-01', 'Shopping', 10.25, '')
+database.add_expense('2025-10-01', 'Shopping', 4.75, '')
+database.add_expense('2025-10-02', 'Transportation', 3, '')
+check_daily_totals('inserts')
+database.update_expense(first, '2025-10-01', 'Shopping', 20, '')
+check_daily_totals('changing an amount')
+database.update_expense(first, '2025-10-03', 'Entertainment', 20, '')
+check_daily_totals('moving to another day and category')
+database.delete_expense(first)
+check_daily_totals('a delete')
+external_write("DELETE FROM expenses WHERE category = 'Transportation'")
+check_daily_totals('a delete from another connection (row removed at count 0)')
+
+# Test 14: add_income_bulk saves all rows or none
+print("\n14. Testing add_income_bulk:")
+use_temp_database()
+database.init_db()
+added = database.add_income_bulk([('2025-09-01', 'Salary', 5000, 'September'),
+                                  ('2025-10-01', 'Salary', 5000, 'October')])
+print(f"   Two rows added: {added} [PASS]" if added == 2 and database.get_total_income() == 10000
+      else f"   FAIL: added {added}, total {database.get_total_income()}")
+print("   Empty input adds nothing [PASS]" if database.add_income_bulk([]) == 0
+      else "   FAIL: empty input")
+try:
+    database.add_income_bulk([('2025-11-01', 'Salary', 5000, 'November'),
+                              ('2025-11-31', 'Salary', 5000, 'No such day')])
+    print("   FAIL: invalid row accepted")
+except ValueError:
+    total = database.get_total_income()
+    print(f"   Invalid row rejects the whole batch (total still {total:.2f}) [PASS]"
+          if total == 10000 else f"   FAIL: part of the batch was saved ({total})")
+
+# Test 15: transaction() commits everything or nothing
+print("\n15. Testing transaction() and add_expenses_bulk:")
+use_temp_database()
+database.init_db()
+with database.transaction('expenses', 'budgets') as cursor:
+    cursor.execute("INSERT INTO expenses (date, category, amount) VALUES ('2025-10-01', 'Other', 5)")
+    cursor.execute("INSERT INTO budgets (category, monthly_limit) VALUES ('Other', 50)")
+print("   Both writes saved [PASS]"
+      if database.get_expense_summary()[0] == 1 and database.get_budget('Other')
+      else "   FAIL: transaction didn't save both writes")
+
+try:
+    with database.transaction('expenses') as cursor:
+        cursor.execute("INSERT INTO expenses (date, category, amount) VALUES ('2025-10-02', 'Other', 5)")
+        cursor.execute("INSERT INTO expenses (date, category, amount) VALUES ('2025-10-02', 'Other', -5)")
+    print("   FAIL: CHECK rule didn't stop the second insert")
+except sqlite3.IntegrityError:
+    count = database.get_expense_summary()[0]
+    print(f"   Failed block rolled back (still {count} expense) [PASS]" if count == 1
+          else f"   FAIL: {count} expenses after a rolled-back block")
+
+added = database.add_expenses_bulk([('2025-10-03', 'Shopping', 10, ''), ('2025-10-03', 'Shopping', 20, '')])
+count, total, _ = database.get_expense_summary()
+print(f"   add_expenses_bulk added {added} [PASS]" if (added, count, total) == (2, 3, 35)
+      else f"   FAIL: added {added}, now {count} rows / {total}")
+try:
+    database.add_expenses_bulk([('2025-10-04', 'Shopping', 10, ''), ('2025-10-04', 'Shopping', 0, '')])
+    print("   FAIL: bulk insert with a zero amount accepted")
+except sqlite3.IntegrityError:
+    print("   Bad row rejects the whole batch [PASS]" if database.get_expense_summary()[0] == 3
+          else "   FAIL: part of the batch was saved")
+
+# Test 16: OFFSET pages cover every row exactly once
+print("\n16. Testing list pages (LIMIT/OFFSET):")
+from app import page_window, _PAGE_SIZE
+use_temp_database()
+database.init_db()
+# Two pages and one row: several expenses per day, so the id tiebreaker matters too
+database.add_expenses_bulk([(f'2025-10-{day % 28 + 1:02d}', 'Shopping', 1, '')
+                            for day in range(2 * _PAGE_SIZE + 1)])
+database.add_income_bulk([(f'2025-10-{day % 28 + 1:02d}', 'Salary', 1, '')
+                          for day in range(2 * _PAGE_SIZE + 1)])
+newest_first = [row['id'] for row in database.get_all_expenses()]
+pages = [[row['id'] for row in database.get_expense_page(_PAGE_SIZE, offset=offset)]
+         for offset in (0, _PAGE_SIZE, 2 * _PAGE_SIZE)]
+print(f"   Expense pages of {[len(page) for page in pages]} rows, in order [PASS]"
+      if sum(pages, []) == newest_first else "   FAIL: expense pages skip or repeat rows")
+income_pages = [[row['id'] for row in database.get_income_page(_PAGE_SIZE, offset=offset)]
+                for offset in (0, _PAGE_SIZE, 2 * _PAGE_SIZE)]
+print("   Income pages cover every record once [PASS]"
+      if sum(income_pages, []) == [row['id'] for row in database.get_all_income()]
+      else "   FAIL: income pages skip or repeat rows")
+
+total = 2 * _PAGE_SIZE + 1
+for query, expected_offset, expected_page in [('', 0, 1), ('?page=2', _PAGE_SIZE, 2),
+                                              ('?page=0', 0, 1), ('?page=abc', 0, 1),
+                                              ('?page=999', 2 * _PAGE_SIZE, 3)]:
+    with app.test_request_context('/expenses' + query):
+        offset, pager = page_window(total)
+    print(f"   /expenses{query or ' (no page)'}: page {pager['page']} of {pager['pages']} [PASS]"
+          if (offset, pager['page'], pager['pages']) == (expected_offset, expected_page, 3)
+          else f"   FAIL: /expenses{query} gave offset {offset}, page {pager['page']}")
+with app.test_request_context('/expenses?page=3&category=Shopping'):
+    _, pager = page_window(total)
+print("   Last page has no next link and keeps the filter [PASS]"
+      if pager['next_url'] is None and 'category=Shopping' in pager['prev_url']
+      else f"   FAIL: {pager}")
+
+# Test 17: Keyset pages (limit/after) cover every row exactly once
+print("\n17. Testing get_all_expenses(limit, after):")
+# Same data as test 16: many expenses share a date, so pages end mid-day
+keyset_pages, after = [], None
+while True:
+    page = database.get_all_expenses(limit=_PAGE_SIZE, after=after)
+    if not page:
+        break
+    keyset_pages.append([row['id'] for row in page])
+    after = (page[-1]['date'], page[-1]['id'])
+print(f"   Keyset pages of {[len(page) for page in keyset_pages]} rows, in order [PASS]"
+      if sum(keyset_pages, []) == newest_first else "   FAIL: keyset pages skip or repeat rows")
+print("   Same pages as LIMIT/OFFSET [PASS]" if keyset_pages == pages
+      else "   FAIL: keyset and OFFSET pages differ")
+print("   limit=0 returns nothing [PASS]" if database.get_all_expenses(limit=0) == []
+      else "   FAIL: limit=0 returned rows")
+
+# Test 18: 304 Not Modified for the chart APIs
+print("\n18. Testing API ETags:")
+for url in ['/api/category-totals', '/api/monthly-trend/6']:
+    first = client.get(url)
+    etag = first.headers.get('ETag', '').strip('"')
+    repeat = client.get(url, headers={'If-None-Match': f'"{etag}"'})
+    print(f"   {url}: JSON, then 304 [PASS]"
+          if first.is_json and etag and repeat.status_code == 304 and not repeat.data
+          else f"   FAIL: {url} gave {first.status_code} then {repeat.status_code}")
+    database.add_expense('2025-10-05', 'Shopping', 1, '')
+    fresh = client.get(url, headers={'If-None-Match': f'"{etag}"'})
+    print(f"   {url}: fresh JSON after a write [PASS]"
+          if fresh.status_code == 200 and fresh.is_json else f"   FAIL: got {fresh.status_code}")
+
+# Test 19: Rejected forms come back filled in, with status 400
+print("\n19. Testing form re-rendering on errors:")
+expense_id = database.add_expense('2025-10-06', 'Shopping', 5, '')
+income_id = database.add_income('2025-10-06', 'Salary', 5, '')
+for label, url, form, action in [
+        ('Add expense', '/add',
+         {'date': '2025-13-01', 'category': 'Shopping', 'amount': '12.5', 'description': 'Kept text'}, '/add'),
+        ('Edit expense', f'/edit/{expense_id}',
+         {'date': '2025-10-06', 'category': 'Shopping', 'amount': '-1', 'description': 'Kept text'},
+         f'/edit/{expense_id}'),
+        ('Add income', '/income/add',
+         {'date': '2025-10-06', 'source': 'Salary', 'amount': 'abc', 'description': 'Kept text'}, '/income/add'),
+        ('Edit income', f'/income/edit/{income_id}',
+         {'date': 'not a date', 'source': 'Salary', 'amount': '10', 'description': 'Kept text'},
+         f'/income/edit/{income_id}')]:
+    response = client.post(url, data=form)
+    html = response.get_data(as_text=True)
+    print(f"   {label}: 400 with the input and the form's URL [PASS]"
+          if response.status_code == 400 and 'Kept text' in html and f'action="{action}"' in html
+          else f"   FAIL: {label} gave {response.status_code}")
+
+# Test 20: Cached budgets, stats and income totals follow every write
+print("\n20. Testing cached budgets, database stats and income totals:")
+use_temp_database()
+database.init_db()
+
+
+def check(label, condition):
+    print(f"   {label} [PASS]" if condition else f"   FAIL: {label}")
+
+
+check('No budgets yet', database.get_budget('Food & Dining') is None and database.get_all_budgets() == [])
+database.set_budget('Food & Dining', 300)
+check('set_budget shows up in get_budget and get_all_budgets',
+      database.get_budget('Food & Dining')['monthly_limit'] == 300 and len(database.get_all_budgets()) == 1)
+external_write("UPDATE budgets SET monthly_limit = 350")
+check('A budget edited from another connection shows up',
+      database.get_budget('Food & Dining')['monthly_limit'] == 350
+      and database.get_all_budgets()[0]['monthly_limit'] == 350)
+check('get_budget (one index lookup) is not memoized, get_all_budgets is',
+      not hasattr(database.get_budget, 'cache_clear') and hasattr(database.get_all_budgets, 'cache_clear'))
+database.delete_budget('Food & Dining')
+check('delete_budget removes it', database.get_budget('Food & Dining') is None)
+
+check('Empty stats', database.get_database_stats()['total_expenses'] == 0)
+database.add_expense('2025-10-07', 'Shopping', 5, '')
+stats = database.get_database_stats()
+check('add_expense updates the stats',
+      stats['total_expenses'] == 1 and stats['latest_date'] == '2025-10-07')
+
+check('No income yet', database.get_total_income(start_date='2025-10-01') == 0)
+income_id = database.add_income('2025-10-07', 'Salary', 250, '')
+check('add_income updates a total asked for by keyword',
+      database.get_total_income(start_date='2025-10-01') == 250)
+database.delete_income(income_id)
+check('delete_income updates it again', database.get_total_income(start_date='2025-10-01') == 0)
+
+# Test 21: The template bytecode cache lives in a private folder
+print("\n21. Testing the template bytecode cache folder:")
+cache_dir = app.jinja_env.bytecode_cache.directory
+if hasattr(os, 'getuid'):  # Owners and modes are a Unix thing
+    info = os.stat(cache_dir)
+    check(f'{cache_dir} is ours and private',
+          info.st_uid == os.getuid() and info.st_mode & 0o077 == 0)
+else:
+    print("   Skipped (not on Unix)")
+
+# Test 22: The date_format filter only reformats real YYYY-MM-DD dates
+print("\n22. Testing the date_format template filter:")
+from app import date_format_filter
+check("'2025-10-01' becomes 'October 01, 2025'", date_format_filter('2025-10-01') == 'October 01, 2025')
+check("Custom format '%m/%d/%Y'", date_format_filter('2025-10-01', '%m/%d/%Y') == '10/01/2025')
+for malformed in ['2_02-01-01', ' 2024-1-01', '2024-1-01', '2025-02-30', '20251001', 'soon', '']:
+    check(f"{malformed!r} is shown unchanged", date_format_filter(malformed) == malformed)
+check("None is shown unchanged", date_format_filter(None) is None)
+
 print("\n" + "="*60)
 print("ALL TESTS COMPLETED")
 print("="*60)
@@ -29,6 +29,10 @@ if sys.platform == 'win32':
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
 
+# Dates used by the date tests, worked out once when the script starts
+_PAST_DATE = '2020-01-01'
+_FUTURE_DATE = (datetime.now() + timedelta(days=365)).strftime('%Y-%m-%d')  # 1 year from now
+
 
 def test_valid_data():
     """Test that valid data passes validation."""
@@ -196,10 +200,10 @@ def test_special_characters_description():
 def test_past_date():
     """Test that past dates are accepted."""
     print("\n" + "="*60)
-    print("TEST 11: Past Date (2020-01-01)")
+    print(f"TEST 11: Past Date ({_PAST_DATE})")
     print("="*60)
 
-    valid, error = validate_expense_data('2020-01-01', 'Food & Dining', 25.50, 'Old expense')
+    valid, error = validate_expense_data(_PAST_DATE, 'Food & Dining', 25.50, 'Old expense')
 
     if valid:
         print("✅ PASS: Past date accepted")
@@ -215,8 +219,7 @@ def test_future_date():
     print("TEST 12: Future Date (1 year from now)")
     print("="*60)
 
-    future = (datetime.now() + timedelta(days=365)).strftime('%Y-%m-%d')
-    valid, error = validate_expense_data(future, 'Food & Dining', 25.50, 'Future expense')
+    valid, error = validate_expense_data(_FUTURE_DATE, 'Food & Dining', 25.50, 'Future expense')
 
     if valid:
         print("⚠️  WARNING: Future date accepted")